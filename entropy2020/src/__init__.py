@@ -31,7 +31,7 @@ import sys
 from os import path
 
 
-with open('config.json') as file:
+with open(path.join(path.dirname(path.abspath(__file__)), 'config.json')) as file:
     config = json.load(file)
 
 
@@ -80,7 +80,6 @@ def output(curves, options, filename=None, *args):
     :filename: output file name as a (format) string *without* the extension
     :args: substitutions to be made in 'filename'
     """
-    if logger.level >= logging.INFO: print(flush=True)
     if term in ('eps', 'gp', 'png'):
         filename = filename.format(*args)
         options['output'] = filename + '.' + term
@@ -117,16 +116,17 @@ POINT_TRIANGLE = 9
 POINT_INVTRIANGLE = 11
 POINT_DIAMOND = 13
 
-# Modules used by figures
+# Modules used by figures (SymPy and gnuplotlib are only loaded when used)
 import math
 import multiprocessing
 import numpy as np
-import sympy as sym
-import gnuplotlib as gp
 from multiprocessing import pool
 
 import utils
 
+sym = utils.lazy_import('sympy')
+gp = utils.lazy_import('gnuplotlib')
+
 logging.basicConfig(format='[%(levelname)s] %(message)s', level=logging.INFO)
 logger = logging.getLogger()
 
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Evaluate entropies and information measures for a table of parameters.
+
+Usage:
+    batch.py input output [-quantities=H,I,...] [-method=M] [-backup=M,...] [-precision=P]
+                          [-mu] [-workers=W] [-memory=GB] [-chunk=ROWS] [-progress]
+
+The input is a CSV file or a NumPy array (.npy) with one point per row: ε, pₐ
+and N, or ε, pₐ and <n> with '-mu'.  A CSV file may start with a header naming
+its columns, among 'epsilon', 'palpha' and 'N' or 'mu' (which implies '-mu').
+The output is a CSV file with the columns 'row' (index of the input row), ε,
+pₐ, N and the quantities, which are 'H', 'H_ON', 'H_OFF' and 'I' (evaluated by
+the 'entropy' functions with the given method, backup methods and precision;
+default: H,H_ON,H_OFF,I with the 'numeric' method and 'fsp' as backup) or any
+measure of the 'measures' module (e.g. renyi_2, KL_poisson, JS).  With the
+'numeric' method, all the quantities of a row are computed in a single pass (see
+'measures'), and the backup methods are used only where it fails.  Failed values
+are written as 'nan'.
+
+Rows are read, evaluated by a pool of W worker processes (default is the number
+of CPUs) and written in chunks, so that memory use does not grow with the size
+of the table, and the next chunk is evaluated while the previous one is written.
+If the output file exists, the run resumes after its last complete row.  With
+'-memory', each worker is limited to that many gigabytes, and with '-progress'
+progress records are appended to 'progress.jsonl' (see 'progress').
+"""
+
+__all__ = ['run']
+
+import csv
+import itertools
+import logging
+import math
+import os
+import sys
+import time
+from functools import partial
+
+import numpy as np
+
+import entropy
+import entropy_async
+import measures
+import progress
+import reparam
+import sweep
+import utils
+
+
+ENTROPY_FUNCTIONS = {
+    'H': entropy.H_external,
+    'H_ON': entropy.H_ON_external,
+    'H_OFF': entropy.H_OFF_external,
+    'I': entropy.I_external,
+}
+
+# Default number of rows evaluated and written at a time.
+CHUNK_ROWS = 1000
+
+# Bytes read from the end of the output file to find its last row.
+TAIL_BYTES = 2**16
+
+
+def run(input_file, output_file, quantities=tuple(ENTROPY_FUNCTIONS), method='numeric', backup_method='fsp',
+        precision=entropy.DOUBLE_PRECISION, mu=False, workers=None, chunk=CHUNK_ROWS, progress_file=None):
+    """Evaluate the quantities for the rows of a table, appending the results to a CSV file.
+
+    :input_file: path of a CSV or .npy file with rows (ε, pₐ, N) or (ε, pₐ, <n>)
+    :output_file: path of the CSV output, resumed if it exists
+    :quantities: names of the quantities, see the module documentation
+    :method: calculation method of the entropies, see 'entropy.H_external'
+    :backup_method: (list of) backup method(s) of the entropies
+    :precision: number of decimal digits of precision of the entropies
+    :mu: whether the third column is the mean number of products <n> instead of N
+    :workers: number of worker processes, default is the number of CPUs, 1 evaluates in this process
+    :chunk: number of rows evaluated and written at a time
+    :progress_file: path of a file to append progress records to, or None
+    :returns: number of rows evaluated
+    """
+    quantities = list(quantities)
+    for name in quantities:
+        if name not in ENTROPY_FUNCTIONS:
+            measures._order(name)  # validate names before starting
+    header = ['row', 'epsilon', 'palpha', 'N'] + quantities
+    start = _resume(output_file, header)
+    total, rows, mu = _read(input_file, mu)
+    rows = itertools.islice(rows, start, None)
+
+    methods = [method] + ([backup_method] if isinstance(backup_method, str) else list(backup_method or []))
+    method, *backup_method = [entropy_async.SERIAL_METHOD.get(m, m) for m in methods]
+    options = {'method': method, 'backup_method': backup_method, 'precision': precision}
+    task = partial(_evaluate_row, quantities=quantities, mu=mu, options=options)
+    workers = workers or os.cpu_count()
+    if start:
+        logging.info("batch: resuming %s after row %d", output_file, start - 1)
+
+    n_rows = 0
+    with open(output_file, 'a', newline='') as file, \
+            progress.Progress(total, 'batch', workers, progress_file) as status:
+        writer = csv.writer(file)
+        if start == 0:
+            writer.writerow(header)
+        status.cached(start)
+
+        def write(results):
+            for values, seconds, failed, memory in results:
+                writer.writerow(values)
+                status.completed(method, seconds, failed, memory)
+            file.flush()
+            return len(results)
+
+        chunks = iter(lambda: list(itertools.islice(rows, chunk)), [])
+        if workers == 1:
+            for rows_chunk in chunks:
+                status.submitted(method, len(rows_chunk))
+                n_rows += write([task(row) for row in rows_chunk])
+        else:
+            with sweep.worker_pool(workers) as pool:
+                pending = None
+                for rows_chunk in chunks:
+                    status.submitted(method, len(rows_chunk))
+                    result = pool.map_async(task, rows_chunk)
+                    if pending is not None:
+                        n_rows += write(pending.get())
+                    pending = result
+                if pending is not None:
+                    n_rows += write(pending.get())
+    return n_rows
+
+
+### Internals ###
+
+def _read(input_file, mu):
+    """Number of rows and iterator of (row index, ε, pₐ, N or <n>) of the input, and whether it has <n>."""
+    if input_file.endswith('.npy'):
+        table = np.load(input_file, mmap_mode='r')
+        if table.ndim != 2 or table.shape[1] != 3:
+            raise ValueError("the input array must have 3 columns")
+        return table.shape[0], ((i,) + tuple(float(v) for v in table[i]) for i in range(table.shape[0])), mu
+
+    with open(input_file, newline='') as file:
+        first = next(csv.reader(file), None)
+        total = sum(1 for line in file if line.strip())
+    columns = None
+    if first is not None:
+        try:
+            [float(v) for v in first]
+            total += 1
+        except ValueError:
+            names = [name.strip() for name in first]
+            mu = mu or 'mu' in names
+            try:
+                columns = [names.index(name) for name in ('epsilon', 'palpha', 'mu' if mu else 'N')]
+            except ValueError:
+                raise ValueError("the header must name the columns 'epsilon', 'palpha' and 'N' or 'mu'") from None
+
+    def rows():
+        with open(input_file, newline='') as file:
+            reader = csv.reader(file)
+            if columns is not None:
+                next(reader)
+            index = 0
+            for line in reader:
+                if not line or not ''.join(line).strip():
+                    continue
+                values = [line[i] for i in columns] if columns is not None else line[:3]
+                yield (index,) + tuple(float(v) for v in values)
+                index += 1
+    return total, rows(), mu
+
+def _resume(output_file, header):
+    """Index of the first row missing from the output, dropping an incomplete last line."""
+    if not os.path.exists(output_file) or os.path.getsize(output_file) == 0:
+        return 0
+    with open(output_file, 'rb+') as file:
+        if file.readline().decode().rstrip('\r\n').split(',') != header:
+            raise ValueError("the output file {!r} has other columns".format(output_file))
+        size = file.seek(0, os.SEEK_END)
+        file.seek(max(0, size - TAIL_BYTES))
+        tail = file.read()
+        complete = tail[:tail.rfind(b'\n') + 1]
+        if len(complete) < len(tail):
+            file.truncate(size - len(tail) + len(complete))
+        lines = complete.splitlines()
+    last = lines[-1].decode() if lines else ''
+    return 0 if last.split(',') == header else int(last.partition(',')[0]) + 1
+
+def _evaluate_row(row, quantities, mu, options):
+    """Values of a row of the output, the time it took, whether any failed and the peak memory."""
+    index, epsilon, palpha, N = row
+    utils.peak_memory(reset=True)
+    start = time.perf_counter()
+    values = dict.fromkeys(quantities, math.nan)
+    # Failures are caught separately, so that each quantity still gets its backup methods.
+    # 'Exception' includes MemoryError, from the worker's memory limit.
+    try:
+        if mu:
+            epsilon, palpha, N = (float(v) for v in reparam.from_mu(epsilon, palpha, N))
+    except Exception as error:
+        logging.debug("batch: row %d failed: %s: %s", index, type(error).__name__, error)
+        N = math.nan
+    else:
+        # In double precision, the entropies are computed in the same pass as the measures,
+        # which are not cached: rows are one-off points, and the output file is the record.
+        one_pass = options['method'] == 'numeric' and options['precision'] <= entropy.DOUBLE_PRECISION
+        measure_names = [q for q in quantities if one_pass or q not in ENTROPY_FUNCTIONS]
+        try:
+            if measure_names:
+                values.update(measures.evaluate(epsilon, palpha, N, measure_names, cache=False))
+        except Exception as error:
+            logging.debug("batch: row %d measures failed: %s: %s", index, type(error).__name__, error)
+        for q in quantities:
+            if q in ENTROPY_FUNCTIONS and not math.isfinite(values[q]):
+                try:
+                    res = ENTROPY_FUNCTIONS[q](epsilon, palpha, N, **options)
+                    values[q] = math.nan if res is None else float(res)
+                except Exception as error:
+                    logging.debug("batch: row %d %s failed: %s: %s", index, q, type(error).__name__, error)
+    values = [values[q] for q in quantities]
+    failed = any(math.isnan(v) for v in values)
+    return [index, epsilon, palpha, N] + values, time.perf_counter() - start, failed, utils.peak_memory()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='[%(levelname)s] %(message)s', level=logging.INFO)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+    flags = dict(arg.lstrip('-').partition('=')[::2] for arg in sys.argv[1:] if arg.startswith('-'))
+    known = {'quantities', 'method', 'backup', 'precision', 'mu', 'workers', 'memory', 'chunk', 'progress'}
+    if len(args) != 2 or not set(flags) <= known:
+        sys.exit(__doc__.strip().split("\n\n")[1])
+    if 'memory' in flags:
+        entropy.set_memory_limit(int(float(flags['memory'])*1e9))
+    options = {}
+    if 'quantities' in flags:
+        options['quantities'] = flags['quantities'].split(',')
+    if 'method' in flags:
+        options['method'] = flags['method']
+    if 'backup' in flags:
+        options['backup_method'] = flags['backup'].split(',') if flags['backup'] else None
+    if 'precision' in flags:
+        options['precision'] = int(flags['precision'])
+    n_rows = run(*args, mu='mu' in flags, workers=int(flags['workers']) if 'workers' in flags else None,
+                 chunk=int(flags.get('chunk') or CHUNK_ROWS),
+                 progress_file=progress.FILE if 'progress' in flags else None, **options)
+    logging.info("batch: %d rows evaluated", n_rows)
@@ -0,0 +1,191 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Incremental regeneration of figures.
+
+The output files of a figure script depend on the script's configuration
+section, on the configuration entries shared by all figures, on the output
+terminal, on the source code of the script and of the local modules it uses,
+directly or indirectly, on the other local files these or the configuration
+name (e.g. the Maple script and the gnuplot palette) and on the points of the
+figure's sweeps in quarantine.  A stamp (hash) of these is saved in the state
+file together with the list of output files, and a figure is stale if its stamp
+changed or one of its outputs is missing.  The 'compile_eps.sh' step is stale if
+the script changed, any figure was regenerated or its output is missing.
+
+Sweeps only compute the points missing from the cache, and the caches of the
+calculations are versioned by the source code of their modules (see the
+'depends' option of 'utils.memoized'), so computed points need no tracking.
+Points in quarantine are plotted as gaps, though, and the figure is stale once
+they are recovered by 'sweep.retry' (or fail again with another reason).
+"""
+
+__all__ = ['State', 'dependencies', 'stamp']
+
+import ast
+import glob
+import hashlib
+import json
+import os
+import re
+
+import sweep
+import utils
+
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_FILE = '.build_state.json'
+
+# Configuration entries used by every figure script (see '__init__.py').
+COMMON_CONFIG = ('default_options', 'term_options', 'title', 'label')
+
+# Terminals that produce files.
+FILE_TERMS = ('eps', 'gp', 'png')
+
+# Local files never counted as dependencies: the configuration is hashed by entries.
+IGNORED_FILES = ('config.json',)
+
+COMPILE_SCRIPT = 'compile_eps.sh'
+COMPILE_OUTPUTS = ('entropy_figs.zip',)
+
+
+def dependencies(module):
+    """Local modules and other files used by a module, transitively, including itself.
+
+    Besides import statements, string literals naming a local module count as
+    dependencies, to catch lazy imports such as utils.lazy_import('numeric'),
+    and so do string literals naming another local file, e.g. 'entropy_external.mpl'.
+
+    :module: module (or script) name, without the '.py' extension
+    :returns: sorted list of module names and file names (with their extension)
+    """
+    found = set()
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        if current in found:
+            continue
+        if _is_file(current):
+            found.add(current)
+        elif os.path.isfile(os.path.join(SRC_DIR, current + '.py')):
+            found.add(current)
+            pending.extend(_referenced_names(current))
+    return sorted(found)
+
+
+def stamp(figure, config, term):
+    """Hash of everything the output files of a figure depend on.
+
+    :figure: figure name, i.e. the script name without extension
+    :config: configuration dictionary
+    :term: output terminal
+    """
+    entries = {k: config.get(k) for k in (figure,) + COMMON_CONFIG}
+    files = set(dependencies(figure)) | set(_config_files(entries))
+    quarantine = sweep.quarantined(sweep.load(config, [figure]))
+    inputs = {
+        'config': entries,
+        'term': term,
+        'code': utils.source_version(*sorted(files)),
+        'quarantine': sorted([repr(task), record['reason']] for task, record in quarantine.items()),
+    }
+    return hashlib.md5(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+class State:
+    """Stamps and outputs of the figures generated in the current directory.
+
+    :config: configuration dictionary
+    :term: output terminal, figures are always stale for non-file terminals
+    :path: state file path
+    """
+    def __init__(self, config, term, path=STATE_FILE):
+        self.config = config
+        self.term = term
+        self.path = path
+        try:
+            with open(path) as file:
+                self.state = json.load(file)
+        except (OSError, ValueError):
+            self.state = {}
+        self.rebuilt = set()
+
+    def stale(self, figure):
+        """Whether the output files of a figure must be regenerated."""
+        if self.term not in FILE_TERMS:
+            return True
+        entry = self.state.get(figure)
+        return entry is None or entry['stamp'] != stamp(figure, self.config, self.term) \
+            or not all(os.path.exists(f) for f in entry['outputs'])
+
+    def update(self, figure, since):
+        """Record the output files of a figure generated after time 'since' (from time.time())."""
+        outputs = [f for f in glob.glob('{}*.{}'.format(figure, self.term)) if os.path.getmtime(f) >= since]
+        self.state[figure] = {'stamp': stamp(figure, self.config, self.term), 'outputs': sorted(outputs)}
+        self.rebuilt.add(figure)
+        self._save()
+
+    def stale_compile(self):
+        """Whether the 'compile_eps.sh' step must be run again."""
+        entry = self.state.get(COMPILE_SCRIPT)
+        return bool(self.rebuilt) or entry is None or entry['stamp'] != self._compile_stamp() \
+            or not all(os.path.exists(f) for f in COMPILE_OUTPUTS)
+
+    def update_compile(self):
+        """Record a successful run of the 'compile_eps.sh' step."""
+        self.state[COMPILE_SCRIPT] = {'stamp': self._compile_stamp(), 'outputs': list(COMPILE_OUTPUTS)}
+        self._save()
+
+    def _compile_stamp(self):
+        with open(os.path.join(SRC_DIR, COMPILE_SCRIPT), 'rb') as file:
+            md5 = hashlib.md5(file.read())
+        for figure in sorted(k for k in self.state if k != COMPILE_SCRIPT):
+            md5.update(self.state[figure]['stamp'].encode())
+        return md5.hexdigest()
+
+    def _save(self):
+        with open(self.path, 'w') as file:
+            json.dump(self.state, file, indent=2, sort_keys=True)
+
+
+### Internals ###
+
+def _referenced_names(module):
+    """Names imported by a module plus its string literals that are valid module names."""
+    with open(os.path.join(SRC_DIR, module + '.py'), 'rb') as file:
+        tree = ast.parse(file.read(), module)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            yield node.module
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str) \
+                and (node.value.isidentifier() or _is_file(node.value)):
+            yield node.value
+
+def _is_file(name):
+    """Whether a name is a local file other than a module, with its extension."""
+    return '.' in name and not name.endswith('.py') and name not in IGNORED_FILES \
+        and os.path.isfile(os.path.join(SRC_DIR, name))
+
+def _config_files(value):
+    """Local files named in the strings of a configuration value, e.g. "load 'default.pal'"."""
+    if isinstance(value, str):
+        yield from (name for name in re.findall(r'[\w.-]+', value) if _is_file(name))
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _config_files(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _config_files(item)
@@ -0,0 +1,139 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Channel capacity of the externally regulated gene.
+
+The mutual information I between the promoter state and the number of products
+is maximized over pₐ (and optionally ε) at a fixed mean expression <n>, with N
+given by 'reparam.from_mu'.  Instead of dense grids, each one-dimensional search
+scans BRACKET_POINTS points to bracket the maximum, which is then refined by
+Brent's method (derivative-free).  The maximization over (pₐ, ε) is nested: the
+maximum over pₐ is a function of ε.  Evaluations go through 'entropy.I_external'
+(sharing its caches) and are also kept in memory, as the searches revisit points.
+
+Example:
+    >>> capacity.maximize(50, epsilon=1)
+    >>> curve = capacity.capacity_curve(np.geomspace(1, 1000, 31), processes=4)
+"""
+
+__all__ = ['capacity_curve', 'information', 'maximize']
+
+import functools
+import math
+
+import numpy as np
+from scipy import optimize
+from scipy.special import expit, logit
+
+import entropy
+import reparam
+import sweep
+
+
+# Search intervals of pₐ and ε.
+PALPHA_BOUNDS = (1e-3, 1 - 1e-6)
+EPSILON_BOUNDS = (1e-2, 1e2)
+
+# Points of the initial scan of each search, evenly spaced in logit(pₐ) or log(ε).
+BRACKET_POINTS = 9
+
+# Absolute tolerance of the maximizers, in logit(pₐ) or log(ε).
+XTOL = 1e-4
+
+
+def information(mu, palpha, epsilon, method='numeric', backup_method='fsp', precision=entropy.DOUBLE_PRECISION):
+    """Mutual information at fixed mean expression.
+
+    :mu: mean number of gene products <n>
+    :palpha: probability of finding the promotor at the ON state
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :method: calculation method, see 'entropy.I_external'
+    :backup_method: (list of) backup method(s)
+    :precision: number of decimal digits of precision
+    :returns: mutual information in bits, or None if the calculation fails
+    """
+    if not isinstance(backup_method, (str, type(None))):
+        backup_method = tuple(backup_method)
+    return _information(float(mu), float(palpha), float(epsilon), method, backup_method, precision)
+
+
+def maximize(mu, epsilon=None, palpha_bounds=PALPHA_BOUNDS, epsilon_bounds=EPSILON_BOUNDS, **options):
+    """Maximum mutual information over pₐ, and over ε unless it is given, at fixed mean expression.
+
+    :mu: mean number of gene products <n>
+    :epsilon: fixed value of ε, or None to maximize over it too
+    :palpha_bounds: search interval of pₐ
+    :epsilon_bounds: search interval of ε
+    :options: 'method', 'backup_method' and 'precision' of 'information'
+    :returns: dictionary with the maximizer 'epsilon', 'palpha' and 'N' and the maximum 'I'
+    """
+    def best_palpha(epsilon):
+        return _maximize(lambda p: information(mu, p, epsilon, **options), logit, expit, palpha_bounds)
+
+    if epsilon is None:
+        epsilon, _ = _maximize(lambda e: best_palpha(e)[1], math.log, math.exp, epsilon_bounds)
+    palpha, I = best_palpha(epsilon)
+    _, _, N = reparam.from_mu(epsilon, palpha, mu)
+    return {'epsilon': float(epsilon), 'palpha': float(palpha), 'N': float(N), 'I': float(I)}
+
+
+def capacity_curve(mu, epsilon=None, processes=None, **options):
+    """Channel capacity as a function of the mean expression.
+
+    :mu: array of mean numbers of gene products <n>
+    :epsilon: fixed value of ε, or None to maximize over it too
+    :processes: number of worker processes (see 'sweep.worker_pool'), 1 evaluates in this process
+    :options: other arguments to 'maximize'
+    :returns: dictionary with arrays 'mu', 'epsilon', 'palpha', 'N' and 'I' (the capacity)
+    """
+    mu = np.atleast_1d(np.asarray(mu, dtype=np.float64))
+    task = functools.partial(maximize, epsilon=epsilon, **options)
+    if processes == 1:
+        res = [task(m) for m in mu]
+    else:
+        with sweep.worker_pool(processes) as pool:
+            res = pool.map(task, mu.tolist())
+    return dict(mu=mu, **{key: np.array([r[key] for r in res]) for key in ('epsilon', 'palpha', 'N', 'I')})
+
+
+### Internals ###
+
+@functools.lru_cache(maxsize=2**16)
+def _information(mu, palpha, epsilon, method, backup_method, precision):
+    """Cached 'information', with hashable arguments."""
+    epsilon, palpha, N = reparam.from_mu(epsilon, palpha, mu)
+    res = entropy.I_external(float(epsilon), float(palpha), float(N), precision=precision, method=method,
+                             backup_method=backup_method)
+    return None if res is None else float(res)
+
+def _maximize(func, to_x, from_x, bounds):
+    """Maximize a function of one variable: bracketing scan, then Brent's method.
+
+    The search is done in the variable x = to_x(value), evenly spaced in the scan.
+    Failed evaluations (None) are taken as -inf.
+
+    :returns: maximizer (as a value) and maximum
+    """
+    def objective(x):
+        res = func(from_x(x))
+        return math.inf if res is None else -res
+
+    grid = np.linspace(to_x(bounds[0]), to_x(bounds[1]), BRACKET_POINTS)
+    values = [objective(x) for x in grid]
+    best = int(np.argmin(values))
+    lower, upper = grid[max(best - 1, 0)], grid[min(best + 1, grid.size - 1)]
+    opt = optimize.minimize_scalar(objective, bounds=(lower, upper), method='bounded', options={'xatol': XTOL})
+    if opt.fun <= values[best]:
+        return from_x(opt.x), -opt.fun
+    return from_x(grid[best]), -values[best]
@@ -0,0 +1,154 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Numeric functions compiled from the symbolic expressions.
+
+The expressions of the 'steady_state' and 'entropy_symbolic' modules (and their inverses
+with respect to any parameter) are turned into Python functions with SymPy's
+lambdify, using either mpmath (arbitrary precision) or NumPy (double precision)
+as backend.  The generated source code is persisted in the cache directory, so
+that SymPy is only imported and the expressions only walked the first time a
+function is requested, or after the modules defining them change.
+
+Example:
+    >>> fano = compiled.lambdified('fano_external')
+    >>> fano(epsilon=2, p_a=0.5, N=100)
+    17.666666666666668
+    >>> N = compiled.inverse('mu_alpha_external', 'N')
+    >>> N(epsilon=2, p_a=0.5, mu_alpha_external=50)
+    75.0
+"""
+
+__all__ = ['EXPRESSIONS', 'inverse', 'lambdified']
+
+import logging
+import os
+from functools import lru_cache
+
+import mpmath
+import numpy as np
+from scipy import special
+
+import utils
+
+
+BACKENDS = ('mpmath', 'numpy')
+
+# Compilable expressions: name -> (module, arguments).
+EXPRESSIONS = {
+    'phi_n_external': ('steady_state', ('epsilon', 'p_a', 'N', 'n')),
+    'alpha_n_external': ('steady_state', ('epsilon', 'p_a', 'N', 'n')),
+    'beta_n_external': ('steady_state', ('epsilon', 'p_a', 'N', 'n')),
+    'mu_external': ('steady_state', ('epsilon', 'p_a', 'N')),
+    'mu_alpha_external': ('steady_state', ('epsilon', 'p_a', 'N')),
+    'mu_beta_external': ('steady_state', ('epsilon', 'p_a', 'N')),
+    'fano_external': ('steady_state', ('epsilon', 'p_a', 'N')),
+    'sigma__2_external': ('steady_state', ('epsilon', 'p_a', 'N')),
+    'H_external_sum_term': ('entropy_symbolic', ('epsilon', 'p_a', 'N', 'n')),
+    'H_ON_external_sum_term': ('entropy_symbolic', ('epsilon', 'p_a', 'N', 'n')),
+    'H_OFF_external_sum_term': ('entropy_symbolic', ('epsilon', 'p_a', 'N', 'n')),
+}
+
+
+def lambdified(name, backend='numpy'):
+    """Numeric function of a symbolic expression.
+
+    :name: name of the expression, one of EXPRESSIONS
+    :backend: either 'mpmath' or 'numpy'
+    :returns: function with the expression arguments as parameters
+    """
+    return _compile(name, None, backend)
+
+
+def inverse(name, var, backend='numpy'):
+    """Numeric function of the inverse of a symbolic expression.
+
+    The inverse takes the same arguments as the expression, with 'var' replaced
+    by the value of the expression (passed by its name if as a keyword).
+
+    :name: name of the expression, one of EXPRESSIONS
+    :var: argument to solve the expression for
+    :backend: either 'mpmath' or 'numpy'
+    :returns: function with the inverse's arguments as parameters
+    """
+    return _compile(name, var, backend)
+
+
+### Internals ###
+
+cache = None
+def global_cache():
+    """Open the cache of generated source code only when a function requires it."""
+    global cache
+    if cache is None:
+        cache = utils.LazyCache(os.path.join(utils.CACHE_DIR, 'compiled'))
+    return cache
+
+def _hyper(a_s, b_s, z):
+    """Generalized hypergeometric function for NumPy, only the ₁F₁ case is implemented."""
+    if len(a_s) != 1 or len(b_s) != 1:
+        raise NotImplementedError("only the KummerM function (1F1) is implemented for NumPy")
+    return special.hyp1f1(a_s[0], b_s[0], z)
+
+def _namespace(backend):
+    """Global namespace for generated functions, equivalent to lambdify's one."""
+    if backend == 'mpmath':
+        namespace = vars(mpmath).copy()
+        namespace.update(pochhammer=mpmath.rf)
+    else:
+        namespace = vars(np).copy()
+        namespace.update(factorial=special.factorial, hyper=_hyper, pochhammer=special.poch)
+    return namespace
+
+def _source(name, var, backend):
+    """Generate the source code of a function from its symbolic expression."""
+    import importlib
+    import inspect
+    import sympy as sym
+
+    module, args = EXPRESSIONS[name]
+    expr = getattr(importlib.import_module(module), name)
+    args = list(args)
+    if var is not None:
+        solutions = sym.solve(sym.Eq(expr, sym.Symbol(name)), sym.Symbol(var))
+        if len(solutions) != 1:
+            raise ValueError("'{}' has no unique solution for '{}'".format(name, var))
+        expr = solutions[0]
+        args[args.index(var)] = name
+
+    modules = [{'pochhammer': mpmath.rf}, 'mpmath'] if backend == 'mpmath' else \
+              [{'factorial': special.factorial, 'hyper': _hyper, 'pochhammer': special.poch}, 'numpy']
+    return inspect.getsource(sym.lambdify(args, expr, modules=modules))
+
+@lru_cache(maxsize=None)
+def _compile(name, var, backend):
+    """Load the function's source from the persistent cache (or generate it) and compile it."""
+    if name not in EXPRESSIONS:
+        raise ValueError("unknown expression '{}'".format(name))
+    if backend not in BACKENDS:
+        raise ValueError("backend must be one of {}".format(", ".join(BACKENDS)))
+
+    module = EXPRESSIONS[name][0]
+    key = (name, var, backend, utils.source_version(module, 'steady_state', 'functions'))
+    source = global_cache().get(key)
+    if source is None:
+        logging.debug("compiled: generating function for '%s' (var = %s, backend = %s)", name, var, backend)
+        source = _source(name, var, backend)
+        global_cache()[key] = source
+
+    namespace = _namespace(backend)
+    exec(compile(source, '<compiled {}>'.format(name), 'exec'), namespace)
+    func = namespace['_lambdifygenerated']
+    func.__name__ = func.__qualname__ = name if var is None else '{}_inverse_{}'.format(name, var)
+    return func
@@ -16,13 +16,14 @@ Shannon's entropy for stochastic gene models.
 
 Functions to calculate the Shannon's entropy, entropy conditional to promoter
 state and mutual information for constitutive and binary stochastic gene models
-using SymPy, Maple or compiled C code.
+using SymPy, Maple, mpmath, double precision (closed forms or the master equation,
+see 'numeric' and 'fsp') or compiled C code.
 """
 
 __all__ = [
         'H_constitutive',
         'H_external', 'H_ON_external', 'H_OFF_external', 'I_external',
-        'set_n_processes', 'symbolic_H',
+        'expressions', 'set_memory_limit', 'set_n_processes',
 ]
 
 import atexit
@@ -33,38 +34,85 @@ import os
 import pathlib
 import signal
 import subprocess as sub
+from functools import lru_cache, partial
 from multiprocessing import pool
 
 import mpmath
-from sympy import *
-from sympy.abc import *
-from sympy import E, N as evalf
 
 import utils
-from functions import log2
-from steady_state import alpha_n_external, beta_n_external, palpha, phi_n_external
+
+# Imported on demand, see also 'expressions'.
+fsp = utils.lazy_import('fsp')
+numeric = utils.lazy_import('numeric')
 
 
 def set_n_processes(n):
     """Initialize number of worker processes in pool. Should be called right after imports."""
-    global N_PROCESSES
+    global N_PROCESSES, _expressions
     N_PROCESSES = n
+    _expressions = None  # parallel expressions depend on N_PROCESSES
 set_n_processes(os.cpu_count())
 
 
+def set_memory_limit(n_bytes):
+    """Limit the memory of each worker process (and Maple subprocess), None for no limit.
+
+    A calculation exceeding the limit fails with MemoryError instead of getting the
+    worker killed by the system.  Should be called before any pool is started.
+    """
+    global MEMORY_LIMIT
+    MEMORY_LIMIT = n_bytes
+set_memory_limit(None)
+
+
+# Number of decimal digits that double precision floats can hold.
+DOUBLE_PRECISION = 15
+
+# Modules (and the Maple script) whose source code versions the cached entropies, see 'utils.memoized'.
+CALCULATION_MODULES = ('entropy', 'entropy_symbolic', 'steady_state', 'functions', 'numeric', 'fsp',
+                       'entropy_external.mpl')
+
 DOC = {
     'epsilon': "ratio between promotor switching rates and protein degradation rate",
     'palpha': "probability of finding the promotor at the ON state",
     'N': "mean number of proteins of a constitutive gene with the same synthesis/degradation rates",
     'k': "upper bound of summation for the entropy calculation",
     'precision': "number of decimal digits of precision",
-    'method': "either 'C', 'maple', 'maple-async', 'sympy' or 'sympy-parallel'",
+    'method': "either 'C', 'fsp', 'maple', 'maple-async', 'mpmath', 'numeric', 'sympy' or 'sympy-parallel'",
     'backup_method': "(list of) backup method(s) to try if 'method' fails",
     'func': "function to be computed",
     'subs': "dictionay with parameters to 'func'",
 }
 
-symbolic_H = {}
+_expressions = None
+def expressions():
+    """Symbolic expressions for the SymPy methods, loaded only when first required.
+
+    The expressions from 'entropy_symbolic' are pickled to the cache directory and
+    loaded from there in later runs, unless the modules defining them change.
+
+    :returns: dictionary with the 'symbolic_H' and 'parallel_H' dictionaries
+    """
+    global _expressions
+    if _expressions is None:
+        cache = utils.LazyCache(os.path.join(utils.CACHE_DIR, 'expressions'))
+        key = (utils.source_version('entropy_symbolic', 'steady_state', 'functions'), N_PROCESSES)
+        _expressions = cache.get(key)
+        if _expressions is None:
+            import entropy_symbolic
+            _expressions = {
+                'symbolic_H': entropy_symbolic.symbolic_H,
+                'parallel_H': entropy_symbolic.parallel_H(N_PROCESSES),
+            }
+            cache[key] = _expressions
+        cache.close()
+    return _expressions
+
+def __getattr__(name):
+    """Lazy access to the module attributes 'symbolic_H' and 'parallel_H'."""
+    if name in ('symbolic_H', 'parallel_H'):
+        return expressions()[name]
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 ### Constitutive gene ###
@@ -77,27 +125,28 @@ symbolic_H = {}
                ⎝e⎠   /⎽⎽⎽, ⎝n!             ⎠
                      n = 0
 """
-H_poisson_const = -N*log2(N/E)
-H_poisson_sum_term = N**n / factorial(n) * exp(-N) * log2(factorial(n))
-H_poisson_sum = Sum(H_poisson_sum_term, (n, 0, oo))
-symbolic_H['constitutive'] = H_poisson_const + H_poisson_sum
 
-@utils.memoized
 def H_constitutive(N, precision=mpmath.mp.dps):
     """Shannon entropy for the constitutive gene model.
 
+    Up to double precision, the entropy is computed numerically and 'N' may be
+    an array.  Higher precisions fall back to the symbolic sum.
+
     :N: mean number of proteins
     :precision: {precision}
     :returns: entropy of a gene with parameter 'N'
     """
-    return symbolic_H['constitutive'].evalf(precision, subs={'N': N})
+    if precision <= DOUBLE_PRECISION:
+        return numeric.H_poisson(N, tol=10**-precision)
+    return _H_constitutive_sympy(N, precision)
 
+@utils.memoized(depends=CALCULATION_MODULES)
+def _H_constitutive_sympy(N, precision):
+    """Shannon entropy for the constitutive gene model evaluated in SymPy."""
+    return expressions()['symbolic_H']['constitutive'].evalf(precision, subs={'N': N})
 
-### Binary gene ###
 
-# Auxiliary expressions for parallel computation on SymPy.
-parallel_H = {}
-parallel_n = i*N_PROCESSES + c  # i: index; c: constant
+### Binary gene ###
 
 
 ## External Regulation Gene ##
@@ -109,11 +158,7 @@ parallel_n = i*N_PROCESSES + c  # i: index; c: constant
          n=0
 """
 
-H_external_sum_term = phi_n_external*log2(phi_n_external)
-symbolic_H['external'] = -Sum(H_external_sum_term, (n, 0, oo))
-parallel_H['external'] = -Sum(H_external_sum_term.subs(n, parallel_n), (i, 0, oo))
-
-def H_external(epsilon, palpha, N, k=oo, precision=mpmath.mp.dps, method='sympy-parallel', backup_method=None):
+def H_external(epsilon, palpha, N, k=math.inf, precision=mpmath.mp.dps, method='sympy-parallel', backup_method=None):
     """Shannon entropy for the externally regulated gene model.
 
     :epsilon: {epsilon}
@@ -138,11 +183,7 @@ def H_external(epsilon, palpha, N, k=oo, precision=mpmath.mp.dps, method='sympy-
            n = 0
 """
 
-H_ON_external_sum_term = alpha_n_external/palpha*log2(alpha_n_external/palpha)
-symbolic_H['ON_external'] = -Sum(H_ON_external_sum_term, (n, 0, oo))
-parallel_H['ON_external'] = -Sum(H_ON_external_sum_term.subs(n, parallel_n), (i, 0, oo))
-
-def H_ON_external(epsilon, palpha, N, k=oo, precision=mpmath.mp.dps, method='sympy-parallel', backup_method=None):
+def H_ON_external(epsilon, palpha, N, k=math.inf, precision=mpmath.mp.dps, method='sympy-parallel', backup_method=None):
     """Entropy conditional to ON state for the externally regulated gene model.
 
     :epsilon: {epsilon}
@@ -157,11 +198,8 @@ def H_ON_external(epsilon, palpha, N, k=oo, precision=mpmath.mp.dps, method='sym
     subs = {'epsilon': epsilon, 'p_a': palpha, 'N': N}
     return _H_dispatch('ON_external', subs, k, precision, method, backup_method)
 
-H_OFF_external_sum_term = beta_n_external/(1 - palpha)*log2(beta_n_external/(1 - palpha))
-symbolic_H['OFF_external'] = -Sum(H_OFF_external_sum_term, (n, 0, oo))
-parallel_H['OFF_external'] = -Sum(H_OFF_external_sum_term.subs(n, parallel_n), (i, 0, oo))
 
-def H_OFF_external(epsilon, palpha, N, k=oo, precision=mpmath.mp.dps, method='sympy-parallel', backup_method=None):
+def H_OFF_external(epsilon, palpha, N, k=math.inf, precision=mpmath.mp.dps, method='sympy-parallel', backup_method=None):
     """Entropy conditional to OFF state for the externally regulated gene model.
 
     :epsilon: {epsilon}
@@ -206,7 +244,7 @@ class IAsyncResult(pool.AsyncResult):
         h, h_on, h_off = (res.get(timeout) if is_async else res for res, is_async in self.results)
         return h - self.palpha*h_on - (1 - self.palpha)*h_off
 
-def I_external(epsilon, palpha, N, k=oo, precision=mpmath.mp.dps, method='sympy-parallel', backup_method=None):
+def I_external(epsilon, palpha, N, k=math.inf, precision=mpmath.mp.dps, method='sympy-parallel', backup_method=None):
     """Mutual information for the externally regulated gene model.
 
     :epsilon: {epsilon}
@@ -244,22 +282,24 @@ def _H_dispatch(func, subs, k, precision, method, backup_method):
     :backup_method: {backup_method}
     :returns: result of 'func' calculation using the required method(s)
     """
-    assert method in {'maple', 'maple-async', 'sympy', 'sympy-parallel'}
+    assert method in {'fsp', 'maple', 'maple-async', 'mpmath', 'numeric', 'sympy', 'sympy-parallel'}
     if isinstance(backup_method, str):
         backup_method = [backup_method]
 
-    elif method == 'maple':
+    if method == 'maple':
         res = _H_maple(func, subs, k, precision)
     elif method == 'maple-async':
-        # FIXME: avoid 'backup_method' bypass by a None returned later by an pool.AsyncResult.
-        # Things should work in a program rerun since (some of) these None async results would be
-        # already cached.
         res = global_pool().apply_async(_H_maple, [func, subs, k, precision])
         try:
             res = res.get(timeout=0.1)
         except mp.TimeoutError:
-            return res
-
+            return BackupAsyncResult(res, func, subs, k, precision, backup_method) if backup_method else res
+    elif method == 'fsp':
+        res = _H_fsp(func, subs, k, precision)
+    elif method == 'mpmath':
+        res = _H_mpmath(func, subs, k, precision)
+    elif method == 'numeric':
+        res = _H_numeric(func, subs, k, precision)
     else:  # method is 'sympy' or 'sympy-parallel'
         res = _H_sympy(func, subs, k, precision, parallel=method.endswith('parallel'))
 
@@ -270,24 +310,59 @@ def _H_dispatch(func, subs, k, precision, method, backup_method):
 
     return res
 
+class BackupAsyncResult(pool.AsyncResult):
+    """Wrapper to an AsyncResult that tries the backup methods if its value is None"""
+    def __init__(self, result, func, subs, k, precision, backup_method):
+        self.result = result
+        self.backup = (func, subs, k, precision, backup_method[0], backup_method[1:])
+
+    def ready(self):
+        return self.result.ready()
+
+    def successful(self):
+        return self.result.successful()
+
+    def wait(self, timeout=None):
+        self.result.wait(timeout)
+
+    def get(self, timeout=None):
+        res = self.result.get(timeout)
+        if res is None:
+            func, subs, k, precision, method, backup_method = self.backup
+            log_msg = "BackupAsyncResult: method 'maple-async' failed, trying '%s' for '%s' with parameters %s"
+            logging.debug(log_msg, method, func, str(subs))
+            res = _H_dispatch(func, subs, k, precision, method, backup_method)
+            if isinstance(res, pool.AsyncResult):
+                res = res.get(timeout)
+        return res
+
 mp_pool = None
 def global_pool():
     """Initialize pool of worker processes only when a function requires it."""
     global mp_pool
     if mp_pool is None:
-        mp_pool = mp.Pool(processes=N_PROCESSES)
+        mp_pool = mp.Pool(processes=N_PROCESSES, initializer=utils.limit_memory, initargs=[MEMORY_LIMIT])
         atexit.register(mp_pool.close)
     return mp_pool
 
 def _map_evalf(arg):
     """Auxiliary function for parallel numeric evaluation.
 
-    :arg: 2-tuple with the variable x and the precision
-    :returns: result equivalent to expr.evalf(x, n)
-    """
-    return evalf(x=arg[0], n=arg[1])
+    Each worker builds its own partial sum from the cached expressions, so that
+    the parent process does not hold one copy of the expression per worker.
 
-@utils.memoized
+    :arg: 5-tuple with the function, parameters, constant c, number of terms and the precision
+    :returns: result equivalent to expr.evalf(n) for the partial sum with constant c
+    """
+    import sympy as sym
+    func, subs, c, k, precision = arg
+    expr = expressions()['parallel_H'][func]
+    # Parallel evaluation requires integers or fractions(?).
+    expr = expr.subs({key: sym.Rational(str(val)) for key, val in subs.items()})
+    expr = expr.replace(sym.oo, k).subs('c', c)
+    return sym.N(expr, precision)
+
+@utils.memoized(cache_none=False, depends=CALCULATION_MODULES)
 def _H_sympy(func, subs, k, precision, parallel):
     """Calculate entropy in SymPy.
 
@@ -298,28 +373,23 @@ def _H_sympy(func, subs, k, precision, parallel):
     :parallel: wether to run summation in parallel
     :returns: result of 'func' evaluation in SymPy with parameters in 'subs'
     """
-    expr = parallel_H[func] if parallel else symbolic_H[func]
+    import sympy as sym
 
     try:
         if not parallel:
-            expr = expr.replace(oo, k)
+            expr = expressions()['symbolic_H'][func].replace(sym.oo, k)
             res = expr.evalf(precision, subs)
             if res == 0:
                 raise RuntimeError
         else:
-            # Parallel evaluation requires integers or fractions(?).
-            expr = expr.subs({key: Rational(str(val)) for key, val in subs.items()})
-            expr = expr.replace(oo, k/N_PROCESSES)
-            args = [(expr.subs('c', c), precision) for c in range(N_PROCESSES)]
+            args = [(func, subs, c, k/N_PROCESSES, precision) for c in range(N_PROCESSES)]
             partial_sums = global_pool().map(_map_evalf, args)
             if any(x == 0 for x in partial_sums):
                 raise RuntimeError
-            res = sum(partial_sums)
-            if logging.getLogger().level >= logging.INFO:
-                print(".", end="", flush=True)  # show progress
+            res = numeric.compensated_sum(partial_sums)
         return res
 
-    # Note: NaN is stored as None (NULL) in diskcache (SQLite).
+    # Note: NaN is stored as None (NULL) in diskcache (SQLite), failures (None) are not cached.
     except (RuntimeError, TypeError):
         logging.debug("_H_sympy: invalid result with precision = {}.".format(precision))
         if precision >= 75:
@@ -329,9 +399,134 @@ def _H_sympy(func, subs, k, precision, parallel):
         logging.debug("_H_sympy: convergence exception with parameters ε = %(epsilon)f, pₐ = %(p_a)f, N = %(N)d", subs)
         return None
 
+def _H_numeric(func, subs, k, precision):
+    """Calculate entropy in double precision, see 'numeric.H_external'.
+
+    :func: {func}
+    :subs: {subs}
+    :k: {k}
+    :precision: {precision}, at most DOUBLE_PRECISION
+    :returns: result of 'func' evaluation with parameters in 'subs', or None if
+        the precision is too high or the result is not finite
+    """
+    if precision > DOUBLE_PRECISION:
+        logging.debug("_H_numeric: precision = %d is beyond double precision.", precision)
+        return None
+    return _H_double('numeric', func, subs, k)
+
+def _H_fsp(func, subs, k, precision):
+    """Calculate entropy in double precision from the truncated master equation, see 'fsp'.
+
+    :func: {func}
+    :subs: {subs}
+    :k: {k}
+    :precision: {precision}, at most DOUBLE_PRECISION
+    :returns: result of 'func' evaluation with parameters in 'subs', or None if
+        the precision is too high or the result is not finite
+    """
+    if precision > DOUBLE_PRECISION:
+        logging.debug("_H_fsp: precision = %d is beyond double precision.", precision)
+        return None
+    return _H_double('fsp', func, subs, k)
+
+def _H_double(backend, func, subs, k):
+    """Entropy 'func' from the triple (H, H_ON, H_OFF) of a double precision backend, or None."""
+    try:
+        hs = _H_triple(backend, subs['epsilon'], subs['p_a'], subs['N'], k)
+    except (ValueError, ZeroDivisionError) as error:  # parameters out of the model's domain
+        logging.debug("_H_%s: %s with parameters %s", backend, error, str(subs))
+        return None
+    res = hs[('external', 'ON_external', 'OFF_external').index(func)]
+    return res if math.isfinite(res) else None
+
+@lru_cache(maxsize=2**10)
+def _H_triple(backend, epsilon, palpha, N, k):
+    """H, H_ON and H_OFF computed once per point by 'numeric' or 'fsp', as the three share one pass."""
+    return (numeric if backend == 'numeric' else fsp).H_external(epsilon, palpha, N, k)
+
+# Terms evaluated at a time by '_H_mpmath'.
+MPMATH_BLOCK = 64
+
+# Extra decimal digits of the working precision of '_H_mpmath'.
+MPMATH_GUARD_DIGITS = 10
+
+# Parameters (x, y) of 'steady_state.dist' for each function, given ε and pₐ.
+MPMATH_DIST = {
+    'external': lambda epsilon, palpha: (epsilon*palpha, epsilon),
+    'ON_external': lambda epsilon, palpha: (1 + epsilon*palpha, 1 + epsilon),
+    'OFF_external': lambda epsilon, palpha: (epsilon*palpha, 1 + epsilon),
+}
+
+@utils.memoized(cache_none=False, depends=CALCULATION_MODULES)
+def _H_mpmath(func, subs, k, precision):
+    """Calculate entropy directly in mpmath, bypassing SymPy, in constant memory.
+
+    The terms are evaluated block by block, until n > N and a block's contribution
+    is negligible at the required precision (or n = k), see '_dist_block'.
+
+    :func: {func}
+    :subs: {subs}
+    :k: {k}
+    :precision: {precision}
+    :returns: result of 'func' evaluation with parameters in 'subs'
+    """
+    N = subs['N']
+    x, y = MPMATH_DIST[func](subs['epsilon'], subs['p_a'])
+
+    with mpmath.workdps(precision + MPMATH_GUARD_DIGITS):
+        tol = mpmath.mpf(10)**-precision
+        res = mpmath.mpf(0)
+        start = 0
+        try:
+            while start <= k:
+                stop = int(min(start + MPMATH_BLOCK, k + 1))
+                block = mpmath.fsum(p*mpmath.log(p, 2) for p in _dist_block(x, y, N, start, stop) if p)
+                res += block
+                if not mpmath.isfinite(res) or start > N and abs(block) <= tol*abs(res):
+                    break
+                start = stop
+        except (mpmath.libmp.NoConvergence, ValueError, ZeroDivisionError):
+            logging.debug("_H_mpmath: convergence exception with parameters ε = %(epsilon)f, pₐ = %(p_a)f, N = %(N)d", subs)
+            return None
+    return -res if mpmath.isfinite(res) else None  # an entropy of zero is a valid result
+
+def _dist_block(x, y, N, start, stop):
+    """Values of 'steady_state.dist' for start <= n < stop, in mpmath, after Kummer's transformation:
+
+               n
+              N  (x)ₙ  -N
+    dist(n) = ──⋅────⋅e  ⋅M(y - x, y + n, N)
+              n! (y)ₙ
+
+    The series of M has only positive terms (no cancellation for large N) and is
+    evaluated for the two last n only, the others follow from the (stable) backward
+    recurrence of 'numeric._log_kummer_range'.  The prefactor is evaluated with
+    log-gamma functions for the first n, and from the ratio of consecutive terms,
+    N⋅(x + n)/((n + 1)⋅(y + n)), for the others.
+    """
+    x, y, N = mpmath.mpf(x), mpmath.mpf(y), mpmath.mpf(N)
+    a = y - x
+    m = stop - start
+    # The terms of the series grow up to about the (N - b)-th, the default limit stops at 6000.
+    maxterms = max(6000, 2*int(N) + 1000)
+    kummer = [None]*(m + 1)
+    kummer[m] = mpmath.hyp1f1(a, y + stop, N, maxterms=maxterms)
+    kummer[m - 1] = mpmath.hyp1f1(a, y + stop - 1, N, maxterms=maxterms)
+    for i in range(m - 2, -1, -1):
+        b = y + start + i
+        kummer[i] = ((b + N)*kummer[i + 1] - N*(b + 1 - a)/(b + 1)*kummer[i + 2])/b
+
+    n = start
+    prefactor = mpmath.exp((n*mpmath.log(N) if n else 0) - mpmath.loggamma(n + 1) + mpmath.loggamma(x + n) - mpmath.loggamma(x)
+                           - mpmath.loggamma(y + n) + mpmath.loggamma(y) - N)
+    for i in range(m):
+        yield prefactor*kummer[i]
+        prefactor *= N*(x + n)/((n + 1)*(y + n))
+        n += 1
+
 root = pathlib.Path(__file__).parent.resolve()
 maple_external = root/'entropy_external.mpl'
-@utils.memoized()
+@utils.memoized(cache_none=False, depends=CALCULATION_MODULES)
 def _H_maple(func, subs, k, precision):
     """Calculate entropy using Maple.
 
@@ -341,15 +536,22 @@ def _H_maple(func, subs, k, precision):
     :precision: {precision}
     :returns: result of 'func' evaluation in Maple with parameters in 'subs'
     """
+    from sympy import Float
+
     maple_func = 'H_' + func
     args = (maple_func, subs['epsilon'], subs['p_a'], subs['N'], precision)
     args = '-cp:=' + ','.join(str(a) for a in args)
-    if not k is oo:
+    if k != math.inf:
         args += ',' + str(k)
     logging.debug("_H_maple: calling Maple with command: %s %s", maple_external, args)
 
-    with sub.Popen([maple_external, args], stdout=sub.PIPE,
-            start_new_session=True, universal_newlines=True) as proc:
+    try:
+        proc = sub.Popen([maple_external, args], stdout=sub.PIPE, start_new_session=True, universal_newlines=True,
+                         preexec_fn=partial(utils.limit_memory, MEMORY_LIMIT) if MEMORY_LIMIT else None)
+    except OSError as error:  # e.g. Maple is not installed, leave it to the backup methods
+        logging.debug("_H_maple: %s", error)
+        return None
+    with proc:
         pgid = os.getpgid(proc.pid)
 
         # Maple subprocesses like to lie around forever... So we KILL it!
@@ -376,10 +578,9 @@ def _H_maple(func, subs, k, precision):
             atexit.unregister(kill_maple)
             kill_maple(who='_H_maple')
 
-    if logging.getLogger().level >= logging.INFO:
-        print(".", end="", flush=True)  # show progress
     return res
 
 
-for func in (H_constitutive, H_external, H_ON_external, H_OFF_external, I_external, _H_dispatch, _H_maple, _H_C):
+for func in (H_constitutive, H_external, H_ON_external, H_OFF_external, I_external,
+             _H_dispatch, _H_fsp, _H_mpmath, _H_numeric, _H_maple):
     func.__doc__ = func.__doc__.format(**DOC)
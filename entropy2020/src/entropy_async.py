@@ -0,0 +1,258 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Asynchronous (asyncio) API for the entropy calculations.
+
+Coroutine versions of the functions of the 'entropy' module, sharing its caches.
+SymPy calculations run in a pool of worker processes and Maple calculations in
+subprocesses driven by the event loop, with no thread blocked per call.  Double
+precision calculations ('numeric' and 'fsp'), which are fast, run in threads.  Every
+coroutine accepts a 'timeout' in seconds (asyncio.TimeoutError is raised) and
+can be cancelled: Maple's process group is killed, while a SymPy calculation
+already running in a worker is left to finish (and be cached) in background.
+
+Example:
+    >>> async def curve(epsilons):
+    ...     return await asyncio.gather(*(H_external_async(e, 0.5, 100, timeout=60) for e in epsilons))
+    >>> asyncio.run(curve([0.1, 1, 10]))
+"""
+
+__all__ = [
+        'H_external_async', 'H_ON_external_async', 'H_OFF_external_async', 'I_external_async',
+        'shutdown',
+]
+
+import asyncio
+import logging
+import math
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import mpmath
+
+import entropy
+import utils
+from entropy import DOC
+
+METHODS = ('fsp', 'maple', 'mpmath', 'numeric', 'sympy')
+
+# Synchronous variants of the methods, parallelism comes from concurrent calls.
+SERIAL_METHOD = {'maple-async': 'maple', 'sympy-parallel': 'sympy'}
+
+# Seconds to wait for Maple if no timeout is given, as in 'entropy'.
+MAPLE_TIMEOUT = 600
+
+# Maximum precision tried when Maple returns NaN, as in 'entropy'.
+MAX_PRECISION = 75
+
+
+async def H_external_async(epsilon, palpha, N, k=math.inf, precision=mpmath.mp.dps, method='sympy',
+                           backup_method=None, timeout=None):
+    """Shannon entropy for the externally regulated gene model.
+
+    :epsilon: {epsilon}
+    :palpha: {palpha}
+    :N: {N}
+    :k: {k}
+    :precision: {precision}
+    :method: one of 'fsp', 'maple', 'mpmath', 'numeric' or 'sympy'
+    :backup_method: {backup_method}
+    :timeout: {timeout}
+    :returns: shannon entropy of gene with parameters ε, pₐ and N
+    """
+    subs = {'epsilon': epsilon, 'p_a': palpha, 'N': N}
+    return await _H_dispatch('external', subs, k, precision, method, backup_method, timeout)
+
+
+async def H_ON_external_async(epsilon, palpha, N, k=math.inf, precision=mpmath.mp.dps, method='sympy',
+                              backup_method=None, timeout=None):
+    """Entropy conditional to ON state for the externally regulated gene model.
+
+    :epsilon: {epsilon}
+    :palpha: {palpha}
+    :N: {N}
+    :k: {k}
+    :precision: {precision}
+    :method: one of 'fsp', 'maple', 'mpmath', 'numeric' or 'sympy'
+    :backup_method: {backup_method}
+    :timeout: {timeout}
+    :returns: shannon entropy of the distribution given the promoter is at ON state
+    """
+    subs = {'epsilon': epsilon, 'p_a': palpha, 'N': N}
+    return await _H_dispatch('ON_external', subs, k, precision, method, backup_method, timeout)
+
+
+async def H_OFF_external_async(epsilon, palpha, N, k=math.inf, precision=mpmath.mp.dps, method='sympy',
+                               backup_method=None, timeout=None):
+    """Entropy conditional to OFF state for the externally regulated gene model.
+
+    :epsilon: {epsilon}
+    :palpha: {palpha}
+    :N: {N}
+    :k: {k}
+    :precision: {precision}
+    :method: one of 'fsp', 'maple', 'mpmath', 'numeric' or 'sympy'
+    :backup_method: {backup_method}
+    :timeout: {timeout}
+    :returns: shannon entropy of the distribution given the promoter is at OFF state
+    """
+    subs = {'epsilon': epsilon, 'p_a': palpha, 'N': N}
+    return await _H_dispatch('OFF_external', subs, k, precision, method, backup_method, timeout)
+
+
+async def I_external_async(epsilon, palpha, N, k=math.inf, precision=mpmath.mp.dps, method='sympy',
+                           backup_method=None, timeout=None):
+    """Mutual information for the externally regulated gene model.
+
+    The three entropies are computed concurrently; if one of them fails or is
+    cancelled, the others are cancelled too.
+
+    :epsilon: {epsilon}
+    :palpha: {palpha}
+    :N: {N}
+    :k: {k}
+    :precision: {precision}
+    :method: one of 'fsp', 'maple', 'mpmath', 'numeric' or 'sympy'
+    :backup_method: {backup_method}
+    :timeout: {timeout}
+    :returns: mutual information of gene with parameters ε, pₐ and N
+    """
+    args = (epsilon, palpha, N, k, precision, method, backup_method, timeout)
+    tasks = [asyncio.ensure_future(f(*args)) for f in (H_external_async, H_ON_external_async, H_OFF_external_async)]
+    try:
+        h, h_on, h_off = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    if any(res is None for res in (h, h_on, h_off)):
+        return None
+    return h - palpha*h_on - (1 - palpha)*h_off
+
+
+def shutdown():
+    """Shut down the pool of worker processes, cancelling the pending calculations."""
+    global executor
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+        executor = None
+
+
+### Internals ###
+
+executor = None
+def global_executor():
+    """Initialize pool of worker processes only when a function requires it."""
+    global executor
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=entropy.N_PROCESSES, initializer=utils.limit_memory,
+                                       initargs=[entropy.MEMORY_LIMIT])
+    return executor
+
+async def _H_dispatch(func, subs, k, precision, method, backup_method, timeout):
+    """Backend calculation dispatcher, see 'entropy._H_dispatch'."""
+    methods = [method] + ([backup_method] if isinstance(backup_method, str) else list(backup_method or []))
+    methods = [SERIAL_METHOD.get(m, m) for m in methods]
+    if not set(methods) <= set(METHODS):
+        raise ValueError("method must be one of {}".format(", ".join(METHODS + tuple(SERIAL_METHOD))))
+
+    res = None
+    for method in methods:
+        if method == 'maple':
+            calculation = _H_maple(func, subs, k, precision)
+        elif method == 'mpmath':
+            calculation = _H_mpmath(func, subs, k, precision)
+        elif method in ('numeric', 'fsp'):
+            calculation = _H_double(func, subs, k, precision, method)
+        else:
+            calculation = _H_sympy(func, subs, k, precision)
+        res = await asyncio.wait_for(calculation, timeout)
+        if res is not None:
+            break
+        logging.debug("_H_dispatch: method '%s' failed for '%s' with parameters %s", method, func, str(subs))
+    return res
+
+async def _H_sympy(func, subs, k, precision):
+    """Calculate entropy in SymPy, in a worker process."""
+    try:
+        return entropy._H_sympy.lookup(func, subs, k, precision, False)
+    except KeyError:
+        pass
+    loop = asyncio.get_running_loop()
+    calculation = partial(entropy._H_sympy, func, subs, k, precision, False)
+    return await loop.run_in_executor(global_executor(), calculation)
+
+async def _H_mpmath(func, subs, k, precision):
+    """Calculate entropy in mpmath, in a worker process."""
+    try:
+        return entropy._H_mpmath.lookup(func, subs, k, precision)
+    except KeyError:
+        pass
+    loop = asyncio.get_running_loop()
+    calculation = partial(entropy._H_mpmath, func, subs, k, precision)
+    return await loop.run_in_executor(global_executor(), calculation)
+
+async def _H_double(func, subs, k, precision, method):
+    """Calculate entropy in double precision with the 'numeric' or 'fsp' method, in a thread."""
+    backend = entropy._H_numeric if method == 'numeric' else entropy._H_fsp
+    return await asyncio.get_running_loop().run_in_executor(None, backend, func, subs, k, precision)
+
+async def _H_maple(func, subs, k, precision):
+    """Calculate entropy using Maple, in a subprocess killed on cancellation."""
+    try:
+        return entropy._H_maple.lookup(func, subs, k, precision)
+    except KeyError:
+        pass
+    from sympy import Float
+
+    args = ('H_' + func, subs['epsilon'], subs['p_a'], subs['N'], precision)
+    args = '-cp:=' + ','.join(str(a) for a in args)
+    if k != math.inf:
+        args += ',' + str(k)
+    logging.debug("_H_maple: calling Maple with command: %s %s", entropy.maple_external, args)
+
+    try:
+        proc = await asyncio.create_subprocess_exec(
+                str(entropy.maple_external), args, stdout=asyncio.subprocess.PIPE, start_new_session=True,
+                preexec_fn=partial(utils.limit_memory, entropy.MEMORY_LIMIT) if entropy.MEMORY_LIMIT else None)
+    except OSError as error:  # e.g. Maple is not installed, leave it to the backup methods
+        logging.debug("_H_maple: %s", error)
+        return None
+    try:
+        line = await asyncio.wait_for(proc.stdout.readline(), MAPLE_TIMEOUT)
+        await proc.wait()
+    except asyncio.TimeoutError:
+        res = None
+    else:
+        res = Float(line.decode())
+        if math.isnan(res):
+            logging.debug("_H_maple: invalid result with precision = %d.", precision)
+            res = None if precision >= MAX_PRECISION else await _H_maple(func, subs, k, precision + 15)
+    finally:
+        # Maple subprocesses like to lie around forever, also when cancelled.
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    if res is not None:  # failures are not cached, as in 'entropy'
+        entropy._H_maple.store(res, func, subs, k, precision)
+    return res
+
+
+DOC = dict(DOC, timeout="seconds to wait for each method, or None to wait indefinitely")
+for func in (H_external_async, H_ON_external_async, H_OFF_external_async, I_external_async):
+    func.__doc__ = func.__doc__.format(**DOC)
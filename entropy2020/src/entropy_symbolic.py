@@ -0,0 +1,63 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Symbolic expressions for the Shannon's entropy of stochastic gene models.
+
+Kept apart from the 'entropy' module, that loads them (pickled) only when a
+SymPy based method is used.  See the 'entropy' module for the formulas.
+"""
+
+from sympy import *
+from sympy.abc import *
+from sympy import E
+
+from functions import log2
+from steady_state import alpha_n_external, beta_n_external, palpha, phi_n_external
+
+symbolic_H = {}
+sum_terms = {}
+
+
+### Constitutive gene ###
+
+H_poisson_const = -N*log2(N/E)
+H_poisson_sum_term = N**n / factorial(n) * exp(-N) * log2(factorial(n))
+H_poisson_sum = Sum(H_poisson_sum_term, (n, 0, oo))
+symbolic_H['constitutive'] = H_poisson_const + H_poisson_sum
+
+
+### Binary gene ###
+
+## External Regulation Gene ##
+
+H_external_sum_term = phi_n_external*log2(phi_n_external)
+H_ON_external_sum_term = alpha_n_external/palpha*log2(alpha_n_external/palpha)
+H_OFF_external_sum_term = beta_n_external/(1 - palpha)*log2(beta_n_external/(1 - palpha))
+
+sum_terms['external'] = H_external_sum_term
+sum_terms['ON_external'] = H_ON_external_sum_term
+sum_terms['OFF_external'] = H_OFF_external_sum_term
+
+for func, term in sum_terms.items():
+    symbolic_H[func] = -Sum(term, (n, 0, oo))
+
+
+def parallel_H(n_processes):
+    """Auxiliary expressions for parallel computation on SymPy.
+
+    The sum over n is split into 'n_processes' sums over i, with n = i⋅n_processes + c,
+    where each process substitutes a different constant c.
+    """
+    parallel_n = i*n_processes + c  # i: index; c: constant
+    return {func: -Sum(term.subs(n, parallel_n), (i, 0, oo)) for func, term in sum_terms.items()}
@@ -17,6 +17,7 @@
 
 from __init__ import *
 from entropy import *
+import sweep
 
 
 options = default_options()
@@ -34,6 +35,9 @@ options['set'].append('format x ""')
 options['set'].append('key left top')
 
 
+results = sweep.figure(config, name(__file__))
+vs_epsilon = results['vs_epsilon']  # axes: palpha, epsilon, mu
+
 plots = [
     {'mu': params['mu'], 'xmin': 0.01, 'xmax': 100}
 ]
@@ -44,19 +48,11 @@ for index, plot in enumerate(plots, start=1):
     # H vs. ε
     options['title'] = PLOT_LETTER.format('A') + title['H_E'] + " ({} = {})".format(label['mu'], plot['mu'])
 
-    partition = 5.
-    epsilon1 = np.logspace(math.log10(plot['xmin']), math.log10(partition + 1), 15)
-    epsilon2 = np.logspace(math.log10(partition), math.log10(plot['xmax'] + 1), 15)
-    epsilon3 = np.logspace(math.log10(100), math.log10(1000), 10)[:-1]
-    epsilon = np.concatenate((epsilon1, epsilon2, epsilon3))
-
-    y = {}
-    for palpha in params['palpha']:
-        y[palpha] = [H_external(e, palpha, plot['mu']/palpha, method='maple-async', backup_method='sympy-parallel') for e in epsilon]
-    for palpha in params['palpha']:
+    epsilon = vs_epsilon.axes['epsilon']
+    for y in vs_epsilon.values['H'][:, :, 0]:
         curves.append((
             epsilon,
-            np.array([val.get() if isinstance(val, pool.AsyncResult) else val for val in y[palpha]]),
+            y,
             #{'legend': palpha}
         ))
 
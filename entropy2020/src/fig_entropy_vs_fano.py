@@ -16,10 +16,11 @@
 
 from __init__ import *
 from entropy import *
-from steady_state import fano_external
 from collections import namedtuple
+import compiled
+import sweep
 
-fano = sym.lambdify(['epsilon', 'p_a', 'N'], fano_external, math)
+fano = compiled.lambdified('fano_external')
 
 
 options = default_options()
@@ -33,10 +34,9 @@ options['set'].append('format x "10^{%T}"')
 epsilon_style = options['with'] + 'linetype {}'
 palpha_style = options['with'].replace('2', '1.5') + 'dashtype "-"'
 
-epsilons = utils.plot_points(0.2, 8, 16, logspace=True).tolist()
-epsilons = sorted(epsilons + params['epsilon'])
-palphas = utils.plot_points(0.9999, 0.015625, 64).tolist()
-Ns = [params['mu']/palpha for palpha in palphas]
+results = sweep.figure(config, name(__file__))
+by_palpha = results['palpha_curves']  # axes: palpha, epsilon, mu
+by_epsilon = results['epsilon_curves']  # axes: epsilon, palpha, mu
 
 
 ### Mutual information ###
@@ -50,39 +50,17 @@ options['set'].append('key at graph 0.99,0.98')
 curves = []
 
 # pₐ curves
-plots = {p: {} for p in params['palpha']}
-
-for palpha, plot in plots.items():
-    N = params['mu']/palpha
-    plot['x'] = [fano(epsilon, palpha, N) for epsilon in epsilons]
-    plot['y'] = [I_external(epsilon, palpha, N, method='maple-async', backup_method='sympy-parallel') for epsilon in epsilons]
-
-for palpha, plot in plots.items():
-    x = np.array(plot['x'])
-    y = np.array([val.get() if isinstance(val, pool.AsyncResult) else val for val in plot['y']])
-    curves.append((x, y, {'with': palpha_style}))
+p = by_palpha.params
+for i, palpha in enumerate(by_palpha.axes['palpha']):
+    x = fano(p['epsilon'][i, :, 0], palpha, p['N'][i, :, 0])
+    curves.append((x, by_palpha.values['I'][i, :, 0], {'with': palpha_style}))
 
 # ε curves
-plots = {
-    params['epsilon'][0]: {"extra_palphas": []},#0.0175, 0.01, 0.005]},
-    params['epsilon'][1]: {"extra_palphas": []},#0.0175, 0.01, 0.005]},
-    params['epsilon'][2]: {"extra_palphas": []},#0.0175, 0.01, 0.0075, 0.005, 0.0025]},
-    params['epsilon'][3]: {"extra_palphas": []},#0.0175, 0.01, 0.0075, 0.005, 0.0025]},
-    params['epsilon'][4]: {"extra_palphas": []},#0.0175, 0.01, 0.0075, 0.005, 0.0025, 0.00175, 0.001, 0.00095, 0.0009, 0.00085]},
-}
-
-for epsilon, plot in plots.items():
-    extra_Ns = [params['mu']/palpha for palpha in plot['extra_palphas']]
-    zip_params = list(zip(palphas + plot['extra_palphas'], Ns + extra_Ns))
-    plot['x'] = [fano(epsilon, palpha, N) for palpha, N in zip_params]
-    plot['y'] = [I_external(epsilon, palpha, N, method='maple-async', backup_method='sympy-parallel') for palpha, N in zip_params]
-
-for color, (epsilon, plot) in enumerate(plots.items(), start=1):
-    x = np.array(plot['x'])
-    y = np.array([val.get() if isinstance(val, pool.AsyncResult) else val for val in plot['y']])
-    curves.append((x, y, {'with': epsilon_style.format(color), 'legend': "{:.2f}".format(epsilon)}))
-
-if logger.level >= logging.INFO: print(flush=True)
+p = by_epsilon.params
+for i, epsilon in enumerate(by_epsilon.axes['epsilon']):
+    x = fano(epsilon, p['palpha'][i, :, 0], p['N'][i, :, 0])
+    curves.append((x, by_epsilon.values['I'][i, :, 0], {'with': epsilon_style.format(i + 1), 'legend': "{:.2f}".format(epsilon)}))
+
 output(curves, options, '{}_I', name(__file__))
 
 
@@ -99,38 +77,17 @@ options['set'][-1] = 'key left bottom'
 curves = []
 
 # pₐ curves
-plots = {p: {} for p in params['palpha']}
-
-for palpha, plot in plots.items():
-    N = params['mu']/palpha
-    plot['x'] = [fano(epsilon, palpha, N) for epsilon in epsilons]
-    plot['y'] = [H_external(epsilon, palpha, N, method='maple-async', backup_method='sympy-parallel') for epsilon in epsilons]
-
-for palpha, plot in plots.items():
-    x = np.array(plot['x'])
-    y = np.array([val.get() if isinstance(val, pool.AsyncResult) else val for val in plot['y']])
-    curves.append((x, y, {'with': palpha_style.format(color), 'legend': '{:.2f}'.format(palpha)}))
+p = by_palpha.params
+for i, palpha in enumerate(by_palpha.axes['palpha']):
+    x = fano(p['epsilon'][i, :, 0], palpha, p['N'][i, :, 0])
+    curves.append((x, by_palpha.values['H'][i, :, 0], {'with': palpha_style, 'legend': '{:.2f}'.format(palpha)}))
 
 
 # ε curves
-plots = {
-    params['epsilon'][0]: {"extra_palphas": []},#0.0175, 0.01, 0.005]},
-    params['epsilon'][1]: {"extra_palphas": []},#0.0175, 0.01, 0.005]},
-    params['epsilon'][2]: {"extra_palphas": []},#0.0175, 0.01, 0.0075, 0.005, 0.0025]},
-    params['epsilon'][3]: {"extra_palphas": []},#0.0175, 0.01, 0.0075, 0.005, 0.0025]},
-    params['epsilon'][4]: {"extra_palphas": []},#0.0175, 0.01, 0.0075, 0.005, 0.0025, 0.00175, 0.001, 0.00095, 0.0009, 0.00085]},
-}
-
-for epsilon, plot in plots.items():
-    extra_Ns = [params['mu']/palpha for palpha in plot['extra_palphas']]
-    extra_params = list(zip(palphas + plot['extra_palphas'], Ns + extra_Ns))
-    plot['x'] = [fano(epsilon, palpha, N) for palpha, N in extra_params]
-    plot['y'] = [H_external(epsilon, palpha, N, method='maple-async', backup_method='sympy-parallel') for palpha, N in extra_params]
-
-for color, (epsilon, plot) in enumerate(plots.items(), start=1):
-    x = np.array(plot['x'])
-    y = np.array([val.get() if isinstance(val, pool.AsyncResult) else val for val in plot['y']])
-    curves.append((x, y, {'with': epsilon_style.format(color)}))
+p = by_epsilon.params
+for i, epsilon in enumerate(by_epsilon.axes['epsilon']):
+    x = fano(epsilon, p['palpha'][i, :, 0], p['N'][i, :, 0])
+    curves.append((x, by_epsilon.values['H'][i, :, 0], {'with': epsilon_style.format(i + 1)}))
 
 ## Custom ε key
 # key_box = 'object rectangle from graph {x0},{y0} to graph {x1},{y1} fillstyle noborder'
@@ -154,5 +111,4 @@ const_y = H_constitutive(params['mu'])
 curves.append((np.array([1]), np.array([const_y]), {'legend': 'const.', 'with': const_style}))
 options['set'].append(const_line.format(x0=1, x1=options['xmax'], y=const_y))
 
-if logger.level >= logging.INFO: print(flush=True)
 output(curves, options, "{}_H", name(__file__))
@@ -15,8 +15,8 @@
 """Graphs of entropy and mutual information vs. mean number of gene products."""
 
 from __init__ import *
-from amphybio.stochastic_gene.entropy import *
-from amphybio.stochastic_gene.steady_state import mu_alpha_external
+from entropy import *
+import sweep
 
 options = default_options()
 params = config[name(__file__)]
@@ -28,9 +28,12 @@ options['ymin'] = 0
 
 # options['set'].append('key')  # modified latter
 
-x = utils.plot_points(0.01, xmax, 25, logspace=True)
+results = sweep.figure(config, name(__file__))
+vs_mu = results['vs_mu']  # axes: epsilon, palpha, mu
+vs_mu_alpha = results['vs_mu_alpha']  # axes: epsilon, palpha, mu_alpha
+x = vs_mu.axes['mu']
 
-const_y = np.array([H_constitutive(N) for N in x])
+const_y = H_constitutive(x)
 const_style = options['with'] + 'linecolor black'
 
 plots = [
@@ -40,6 +43,7 @@ plots = [
 ]
 
 for index, plot in enumerate(plots, start=1):
+    i = params['epsilon'].index(plot['epsilon'])
     options['ymax'] = 7.5
 
     # H vs. <n>
@@ -49,18 +53,11 @@ for index, plot in enumerate(plots, start=1):
     options['ylabel'] = label['H']
     # options['set'][-1] = 'key ' + plot['key']
 
-    ys = {}
-    for palpha in params['palpha']:
-        Ns = [mu/palpha for mu in x]  # mu == palpha*N
-        ys[palpha] = [H_external(plot['epsilon'], palpha, N, method='maple-async', backup_method='sympy-parallel') for N in Ns]
-
     curves = []
-    for palpha in params['palpha']:
-        y = np.array([val.get() if isinstance(val, pool.AsyncResult) else val for val in ys[palpha]])
+    for y in vs_mu.values['H'][i]:
         curves.append((x, y)) #, {'legend': palpha}))
     curves.append((x, const_y, {'with': const_style}))
 
-    if logger.level >= logging.INFO: print(flush=True)
     output(curves, options, '{}_{}_H', name(__file__), index)
 
     # Hₒₙ vs. <nₐ>
@@ -74,19 +71,11 @@ for index, plot in enumerate(plots, start=1):
     if logger.level == logging.DEBUG:
         options['title'] += " ({} = {:.1f})".format(label['epsilon'], plot['epsilon'])
 
-    ys = {}
-    for palpha in params['palpha']:
-        expr = mu_alpha_external.subs({'epsilon': plot['epsilon'], 'p_a': palpha})
-        Ns = [sym.solve(sym.Eq(expr, mu_alpha), sym.Symbol('N'))[0] for mu_alpha in x]
-        ys[palpha] = [H_ON_external(plot['epsilon'], palpha, N, method='maple-async', backup_method='sympy-parallel') for N in Ns]
-
     curves = []
-    for palpha in params['palpha']:
-        y = np.array([val.get() if isinstance(val, pool.AsyncResult) else val for val in ys[palpha]])
-        curves.append((x, y, {'legend': palpha}))
+    for palpha, y in zip(params['palpha'], vs_mu_alpha.values['H_ON'][i]):
+        curves.append((vs_mu_alpha.axes['mu_alpha'], y, {'legend': palpha}))
     curves.append((x, const_y, {'with': const_style, 'legend': 'const.'}))
 
-    if logger.level >= logging.INFO: print(flush=True)
     output(curves, options, '{}_{}_H_ON', name(__file__), index)
     options['set'][-3:] = []  # remove key
 
@@ -103,16 +92,9 @@ for index, plot in enumerate(plots, start=1):
     if logger.level == logging.DEBUG:
         options['title'] += " ({} = {:.1f})".format(label['epsilon'], plot['epsilon'])
 
-    ys = {}
-    for palpha in params['palpha']:
-        Ns = [mu/palpha for mu in x]  # mu == palpha*N
-        ys[palpha] = [I_external(plot['epsilon'], palpha, N, method='maple-async', backup_method='sympy-parallel') for N in Ns]
-
     curves = []
-    for palpha in params['palpha']:
-        y = np.array([val.get() if isinstance(val, pool.AsyncResult) else val for val in ys[palpha]])
+    for y in vs_mu.values['I'][i]:
         curves.append((x, y)) #, {'legend': palpha}))
 
-    if logger.level >= logging.INFO: print(flush=True)
     output(curves, options, '{}_{}_I', name(__file__), index)
     options['set'][-2:] = []  # remove logscale y and ytics
@@ -17,6 +17,7 @@
 
 from __init__ import *
 from entropy import *
+import sweep
 
 options = default_options()
 params = config[name(__file__)]
@@ -33,6 +34,9 @@ options['set'].append('key opaque font ",18"')
 options['set'].append('key right top')
 
 
+results = sweep.figure(config, name(__file__))
+vs_epsilon = results['vs_epsilon']  # axes: palpha, epsilon, mu
+
 plots = [
 
     {'mu': params['mu'], 'xmin': 0.01, 'xmax': 100}
@@ -49,19 +53,11 @@ for index, plot in enumerate(plots, start=1):
     if logger.level == logging.DEBUG:
         options['title'] += " ({} = {})".format(label['mu'], plot['mu'])
 
-    partition = 5.
-    epsilon1 = np.logspace(math.log10(plot['xmin']), math.log10(partition + 1), 15)
-    epsilon2 = np.logspace(math.log10(partition), math.log10(plot['xmax'] + 1), 8)
-    # epsilon3 = np.logspace(math.log10(100), math.log10(1000), 10)[:-1]
-    epsilon = np.concatenate((epsilon1, epsilon2)) #, epsilon3))
-
-    y = {}
-    for palpha in params['palpha']:
-        y[palpha] = [I_external(e, palpha, plot['mu']/palpha, method='maple-async', backup_method='sympy-parallel') for e in epsilon]
-    for palpha in params['palpha']:
+    epsilon = vs_epsilon.axes['epsilon']
+    for palpha, y in zip(params['palpha'], vs_epsilon.values['I'][:, :, 0]):
         curves.append((
             epsilon,
-            np.array([val.get() if isinstance(val, pool.AsyncResult) else val for val in y[palpha]]),
+            y,
             {'legend': palpha}
         ))
 
@@ -0,0 +1,179 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Maximum likelihood fit of the externally regulated gene to count histograms.
+
+Given a histogram cₙ of the number of products in single cells, the parameters
+(ε, pₐ, N) maximize the log-likelihood Σ cₙ⋅log(φₙ).  log(φₙ) and its gradient
+are evaluated together by 'numeric' (see 'log_dist_external_grad'), so that each
+evaluation of the likelihood and its gradient takes O(max(n) + N) operations.
+
+The optimization (L-BFGS-B) is done in the unbounded variables (log(ε),
+logit(pₐ), log(N)), from a moment estimate.  Many histograms are fitted in
+parallel in a pool of worker processes, and each result includes the entropies
+and mutual information of the fitted model (see 'numeric.H_external').
+
+Example:
+    >>> counts = np.bincount(ssa.steady_state(1, 0.5, 100, 10**4)[0])
+    >>> fitting.fit(counts)
+    >>> fitting.fit_many([counts, ...], processes=4)
+"""
+
+__all__ = ['fit', 'fit_many', 'log_likelihood', 'log_phi']
+
+import math
+
+import numpy as np
+from scipy import optimize
+from scipy.special import expit, logit
+
+import numeric
+import sweep
+
+
+# Bounds of the fitted parameters: ε, pₐ and N.
+EPSILON_BOUNDS = (1e-4, 1e4)
+PALPHA_BOUNDS = (1e-6, 1 - 1e-9)
+N_BOUNDS = (1e-3, 1e7)
+
+# Default parameters where the moments don't identify them.
+DEFAULT_EPSILON = 1.
+
+# Tolerance of the projected gradient of the mean log-likelihood.
+FIT_TOL = 1e-9
+
+
+def log_phi(epsilon, palpha, N, n, grad=False):
+    """Logarithm of the marginal distribution φₙ of the externally regulated gene, and its gradient.
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: probability of finding the promotor at the ON state, 0 < pₐ < 1 for the gradient
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :n: (array of) number(s) of gene products
+    :grad: whether to return the gradient too
+    :returns: array with log(φₙ) or, if 'grad' is true, a tuple with it and an array of
+        shape (3,) + n.shape with its derivatives with respect to ε, pₐ and N
+    """
+    n = np.asarray(n, dtype=np.float64)
+    if not grad:
+        return numeric._log_dist(epsilon*palpha, epsilon, N, n)
+    res, (d_x, d_y, d_N) = numeric._log_dist_grad(epsilon*palpha, epsilon, N, n)
+    return res, np.stack([palpha*d_x + d_y, epsilon*d_x, d_N])
+
+
+def log_likelihood(epsilon, palpha, N, counts, grad=False):
+    """Log-likelihood of a histogram under the externally regulated gene model.
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: probability of finding the promotor at the ON state
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :counts: histogram, i.e. number of cells with n = 0, 1, 2... products
+    :grad: whether to return the gradient too
+    :returns: Σ cₙ⋅log(φₙ) or, if 'grad' is true, a tuple with it and its gradient with respect to ε, pₐ and N
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    n = np.flatnonzero(counts)
+    res = log_phi(epsilon, palpha, N, n, grad)
+    if not grad:
+        return numeric.compensated_sum(counts[n]*res)
+    value, gradient = res
+    return numeric.compensated_sum(counts[n]*value), gradient @ counts[n]
+
+
+def fit(counts, x0=None):
+    """Maximum likelihood estimate of the parameters from a histogram.
+
+    :counts: histogram, i.e. number of cells with n = 0, 1, 2... products
+    :x0: initial (ε, pₐ, N), default is a moment estimate
+    :returns: dictionary with the estimates 'epsilon', 'palpha' and 'N', the 'log_likelihood',
+        whether the optimization 'converged', and the entropies 'H', 'H_ON', 'H_OFF' and 'I' in bits
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    cells = counts.sum()
+    if cells <= 0:
+        raise ValueError("empty histogram")
+    n = np.flatnonzero(counts)
+    weights = counts[n]/cells
+
+    def objective(theta):
+        epsilon, palpha, N = _from_theta(theta)
+        value, gradient = log_phi(epsilon, palpha, N, n, grad=True)
+        jacobian = (epsilon, palpha*(1 - palpha), N)  # d(ε, pₐ, N)/dθ
+        return -numeric.compensated_sum(weights*value), -(gradient @ weights)*jacobian
+
+    bounds = [(math.log(EPSILON_BOUNDS[0]), math.log(EPSILON_BOUNDS[1])),
+              (logit(PALPHA_BOUNDS[0]), logit(PALPHA_BOUNDS[1])),
+              (math.log(N_BOUNDS[0]), math.log(N_BOUNDS[1]))]
+    theta0 = np.clip(_to_theta(*(x0 or _moments_estimate(counts))), *np.transpose(bounds))
+    opt = optimize.minimize(objective, theta0, jac=True, method='L-BFGS-B', bounds=bounds,
+                            options={'gtol': FIT_TOL})
+
+    epsilon, palpha, N = (float(v) for v in _from_theta(opt.x))
+    H, H_ON, H_OFF = numeric.H_external(epsilon, palpha, N)
+    return {
+        'epsilon': epsilon, 'palpha': palpha, 'N': N,
+        'log_likelihood': -float(opt.fun*cells), 'converged': bool(opt.success),
+        'H': H, 'H_ON': H_ON, 'H_OFF': H_OFF, 'I': H - palpha*H_ON - (1 - palpha)*H_OFF,
+    }
+
+
+def fit_many(histograms, processes=None, chunksize=None):
+    """Fit many histograms, in parallel.
+
+    :histograms: sequence of histograms (see 'fit'), e.g. the rows of a 2-D array
+    :processes: number of worker processes (see 'sweep.worker_pool'), 1 fits in this process
+    :chunksize: number of histograms sent to a worker at once, default is chosen by 'multiprocessing'
+    :returns: list of dictionaries, as returned by 'fit', in the order of the histograms
+    """
+    if processes == 1:
+        return [fit(counts) for counts in histograms]
+    with sweep.worker_pool(processes) as pool:
+        return pool.map(fit, histograms, chunksize)
+
+
+### Internals ###
+
+def _to_theta(epsilon, palpha, N):
+    """Unbounded optimization variables."""
+    return np.array([math.log(epsilon), logit(palpha), math.log(N)])
+
+def _from_theta(theta):
+    """Parameters (ε, pₐ, N) from the optimization variables."""
+    return math.exp(theta[0]), expit(theta[1]), math.exp(theta[2])
+
+def _moments_estimate(counts):
+    """Parameters matching the first three factorial moments of a histogram.
+
+    φₙ is a mixture of Poisson(N⋅u) with u ~ Beta(ε⋅pₐ, ε⋅(1 - pₐ)), whose
+    factorial moments are Nᵏ⋅E[uᵏ].  The ratios of consecutive moments, r₁ = <n>,
+    r₂ = N⋅(ε⋅pₐ + 1)/(ε + 1) and r₃ = N⋅(ε⋅pₐ + 2)/(ε + 2), give N, ε and pₐ.
+    Where they don't (e.g. for sub-Poisson samples), ε = DEFAULT_EPSILON and N, pₐ
+    match the mean and variance.
+    """
+    n = np.arange(counts.size)
+    p = counts/counts.sum()
+    m1, m2, m3 = (float(p @ moment) for moment in (n, n*(n - 1), n*(n - 1)*(n - 2)))
+    mean = max(m1, 1e-3)
+    try:
+        r1, r2, r3 = m1, m2/m1, m3/m2
+        N = (r2*(r3 - r1) - 2*r3*(r2 - r1))/(r3 - 2*r2 + r1)
+        epsilon = (N - r2)/(r2 - r1)
+        palpha = r1/N
+        if epsilon > 0 and 0 < palpha < 1 and math.isfinite(N):
+            return epsilon, palpha, N
+    except ZeroDivisionError:
+        pass
+    fano = max((m2 + m1 - m1**2)/mean, 1 + 1e-3)
+    N = mean + (fano - 1)*(1 + DEFAULT_EPSILON)
+    return DEFAULT_EPSILON, mean/N, N
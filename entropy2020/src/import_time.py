@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Measure the import time of the modules used by short-lived processes.
+
+Each module is imported in a fresh interpreter (best of a few runs) and its time
+is compared to the budget below.  Modules that shall not load SymPy at import
+are also checked for it.  Exits with status 1 if any check fails.
+
+Usage:
+    import_time.py [module ...]
+"""
+
+import subprocess
+import sys
+
+# Import time budget in seconds and whether SymPy may be loaded.
+BUDGET = {
+    'utils': (0.3, False),
+    'entropy': (0.5, False),
+    'numeric': (1.0, False),
+    'compiled': (1.0, False),
+    'reparam': (1.0, False),
+}
+RUNS = 3
+
+CODE = "import sys, time; t = time.perf_counter(); import {0}; print(time.perf_counter() - t, 'sympy' in sys.modules)"
+
+
+def import_time(module):
+    """Best import time (in seconds) of 'module' in a new interpreter and whether it loaded SymPy."""
+    results = []
+    for _ in range(RUNS):
+        out = subprocess.check_output([sys.executable, '-c', CODE.format(module)], universal_newlines=True)
+        seconds, sympy_loaded = out.split()
+        results.append((float(seconds), sympy_loaded == 'True'))
+    return min(results)
+
+
+if __name__ == '__main__':
+    failed = False
+    for module in sys.argv[1:] or BUDGET:
+        budget, sympy_allowed = BUDGET.get(module, (float('inf'), True))
+        seconds, sympy_loaded = import_time(module)
+        ok = seconds <= budget and (sympy_allowed or not sympy_loaded)
+        failed |= not ok
+        print("{:<10} {:6.3f} s (budget {:.1f} s){}  {}".format(
+            module, seconds, budget, "  [loads SymPy]" if sympy_loaded else "", "ok" if ok else "FAIL"))
+    sys.exit(failed)
@@ -0,0 +1,167 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Information measures of the externally regulated gene, in bits.
+
+The distributions φₙ, αₙ and βₙ of a point are evaluated once (in double
+precision, see 'numeric.log_dist_external') and every requested measure is
+accumulated from them in the same pass.  Measures are cached individually, like
+the entropies of the 'entropy' module, so that only the missing ones of a
+request are computed, together.  The measures are:
+
+    'H', 'H_ON', 'H_OFF', 'I'   Shannon entropies and mutual information
+    'renyi_<q>'                 Rényi entropy of order q of φₙ (e.g. 'renyi_2',
+                                'renyi_0.5', 'renyi_inf'), log₂(∑ φₙ^q)/(1 - q),
+                                which is infinite for q = 0
+    'KL_poisson'                Kullback-Leibler divergence of φₙ from the Poisson
+                                distribution with the same mean, <n> = pₐ⋅N
+    'JS'                        Jensen-Shannon divergence between the conditional
+                                distributions αₙ/pₐ and βₙ/(1 - pₐ)
+
+Example:
+    >>> measures.evaluate(1, 0.5, 100, ['H', 'renyi_2', 'KL_poisson', 'JS'])
+    >>> measures.evaluate_many([(1, 0.5, 100), (2, 0.5, 100)], ['I', 'JS'], processes=2)
+"""
+
+__all__ = ['MEASURES', 'evaluate', 'evaluate_many']
+
+import math
+from functools import partial
+
+import numpy as np
+from scipy.special import gammaln, logsumexp, xlogy
+
+import numeric
+import sweep
+import utils
+from numeric import LOG2, compensated_sum
+
+
+MEASURES = ('H', 'H_ON', 'H_OFF', 'I', 'renyi_<q>', 'KL_poisson', 'JS')
+
+
+def evaluate(epsilon, palpha, N, names, k=math.inf, cache=True):
+    """Information measures at a point, computed in a single pass for the ones not cached.
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: probability of finding the promotor at the ON state, 0 < pₐ < 1
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :names: (list of) measure name(s), see MEASURES
+    :k: upper bound of summation
+    :cache: whether to look the measures up in the persistent cache and store them there,
+        pass False for one-off points (e.g. the rows of a table) not to fill the cache
+    :returns: dictionary of name -> value
+    """
+    names = [names] if isinstance(names, str) else list(names)
+    for name in names:
+        _order(name)  # validate names before any calculation
+    if not cache:
+        return _evaluate(epsilon, palpha, N, names, k)
+    res = {}
+    for name in names:
+        try:
+            res[name] = _measure.lookup(epsilon, palpha, N, name, k)
+        except KeyError:
+            pass
+    missing = [name for name in names if name not in res]
+    if missing:
+        values = _evaluate(epsilon, palpha, N, missing, k)
+        for name in missing:
+            _measure.store(values[name], epsilon, palpha, N, name, k)
+        res.update(values)
+    return {name: res[name] for name in names}
+
+
+def evaluate_many(points, names, k=math.inf, processes=None, cache=True):
+    """Information measures at many points, in parallel.
+
+    :points: sequence of (ε, pₐ, N)
+    :names: (list of) measure name(s), see MEASURES
+    :k: upper bound of summation
+    :processes: number of worker processes (see 'sweep.worker_pool'), 1 evaluates in this process
+    :cache: whether to use the persistent cache, see 'evaluate'
+    :returns: list of dictionaries, as returned by 'evaluate', in the order of the points
+    """
+    task = partial(_evaluate_point, names=names, k=k, cache=cache)
+    if processes == 1:
+        return [task(point) for point in points]
+    with sweep.worker_pool(processes) as pool:
+        return pool.map(task, points)
+
+
+### Internals ###
+
+@utils.memoized(depends=('measures', 'numeric'))
+def _measure(epsilon, palpha, N, name, k):
+    """Calculate a single measure, see 'evaluate'."""
+    return _evaluate(epsilon, palpha, N, [name], k)[name]
+
+def _evaluate_point(point, names, k, cache):
+    """'evaluate' with the parameters in a tuple, for 'Pool.map'."""
+    return evaluate(*point, names, k, cache)
+
+def _order(name):
+    """Order q of a Rényi entropy name, or None for the other measures."""
+    if name in MEASURES and name != 'renyi_<q>':
+        return None
+    prefix, _, order = name.partition('_')
+    try:
+        if prefix == 'renyi' and float(order) >= 0:
+            return float(order)
+    except ValueError:
+        pass
+    raise ValueError("unknown measure {!r}, expected one of {}".format(name, ", ".join(MEASURES)))
+
+def _evaluate(epsilon, palpha, N, names, k):
+    """Evaluate the measures from a single evaluation of the distributions."""
+    n = np.arange(min(k, math.ceil(N + 12*math.sqrt(N) + 40)) + 1)
+    log_phi, log_alpha, log_beta = numeric.log_dist_external(epsilon, palpha, N, n)
+    log_on, log_off = log_alpha - math.log(palpha), log_beta - math.log(1 - palpha)  # conditional distributions
+
+    def shannon(log_p):
+        return -compensated_sum(_xexpx(log_p))/LOG2
+
+    def kl(log_p, log_q):
+        with np.errstate(invalid='ignore'):
+            return compensated_sum(np.where(np.isneginf(log_p), 0, np.exp(log_p)*(log_p - log_q)))/LOG2
+
+    res = {}
+    for name in names:
+        if name in ('H', 'H_ON', 'H_OFF', 'I'):
+            if 'H' not in res:
+                res.update(H=shannon(log_phi), H_ON=shannon(log_on), H_OFF=shannon(log_off))
+            res['I'] = res['H'] - palpha*res['H_ON'] - (1 - palpha)*res['H_OFF']
+        elif name == 'KL_poisson':
+            mu = palpha*N
+            res[name] = kl(log_phi, xlogy(n, mu) - mu - gammaln(n + 1))
+        elif name == 'JS':
+            log_mix = np.logaddexp(log_on, log_off) - math.log(2)
+            res[name] = (kl(log_on, log_mix) + kl(log_off, log_mix))/2
+        else:
+            q = _order(name)
+            if q == 0:
+                res[name] = math.inf  # log₂ of the size of the support, which is unbounded
+            elif q == 1:
+                res[name] = shannon(log_phi)
+            elif q == math.inf:
+                res[name] = -log_phi.max()/LOG2
+            else:
+                with np.errstate(invalid='ignore'):
+                    res[name] = logsumexp(np.where(np.isneginf(log_phi), -np.inf, q*log_phi))/((1 - q)*LOG2)
+    return {name: float(res[name]) for name in names}
+
+def _xexpx(log_p):
+    """Terms p⋅log(p), with 0⋅log(0) = 0."""
+    with np.errstate(invalid='ignore'):
+        return np.where(np.isneginf(log_p), 0, np.exp(log_p)*log_p)
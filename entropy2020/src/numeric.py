@@ -0,0 +1,427 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Numerical (floating point) counterparts of the symbolic expressions.
+
+Vectorized NumPy/SciPy implementations of quantities otherwise computed with
+SymPy or Maple, to be used where double precision suffices.
+"""
+
+__all__ = [
+        'H_external', 'H_external_grad', 'H_poisson', 'I_external_grad', 'compensated_sum', 'dist_external',
+        'log_dist_external', 'log_dist_external_grad', 'poisson',
+]
+
+import math
+
+import numpy as np
+from scipy.special import digamma, gammaln, logsumexp, xlogy
+
+
+LOG2 = math.log(2)
+
+# Coefficients of the large-N asymptotic series of the Poisson entropy (in nats):
+#   H = ½⋅ln(2πeN) - 1/(12N) - 1/(24N²) - 19/(360N³) - 9/(80N⁴) - 863/(2520N⁵) + O(N⁻⁶)
+_H_POISSON_SERIES = (-1/12, -1/24, -19/360, -9/80, -863/2520)
+_H_POISSON_REMAINDER = 2  # bound on the coefficient of the O(N⁻⁶) term
+
+
+def H_poisson(N, tol=1e-12):
+    """Shannon entropy of the Poisson distribution, in bits.
+
+    Exact summation over the bulk of the distribution for small N and the
+    asymptotic series for large N, chosen by the tolerance.  The terms of the sum
+    are evaluated as in Loader's algorithm (see '_log_poisson'), so that the
+    rounding error stays around 1e-15 up to the largest N summed, and tolerances
+    down to that are met.
+
+    :N: mean of the distribution (scalar or array-like)
+    :tol: absolute tolerance of the result
+    :returns: entropy with the same shape as 'N'
+    """
+    N = np.asarray(N, dtype=np.float64)
+    if np.any(N < 0):
+        raise ValueError("N must be >= 0")
+    H = np.empty_like(N)
+
+    # Asymptotic series is used where the truncation error is below 'tol'.
+    N_asymptotic = (_H_POISSON_REMAINDER/(tol*LOG2))**(1/6)
+    large = N >= N_asymptotic
+    if np.any(large):
+        N_large = N[large]
+        series = sum(c/N_large**i for i, c in enumerate(_H_POISSON_SERIES, start=1))
+        H[large] = (0.5*np.log(2*math.pi*math.e*N_large) + series)/LOG2
+
+    small = ~large
+    if np.any(small):
+        N_small = N[small][..., np.newaxis]
+        # Upper tail is negligible beyond N + 12σ (plus some slack for small N).
+        k = math.ceil(N_asymptotic + 12*math.sqrt(N_asymptotic) + 40)
+        n = np.arange(k)
+        log_p = _log_poisson(N_small, n)
+        p = np.exp(log_p)
+        with np.errstate(invalid='ignore'):
+            H[small] = -compensated_sum(np.where(p > 0, p*log_p, 0), axis=-1)/LOG2
+
+    return H[()] if H.ndim == 0 else H
+
+
+def H_external(epsilon, palpha, N, k=math.inf):
+    """Shannon entropies of the externally regulated gene, in bits.
+
+    Double precision counterpart of the 'entropy' functions: the distributions are
+    evaluated in log space and the terms accumulated with compensated summation.
+    The distributions are mixtures of Poisson distributions with means up to N,
+    so the sums are truncated where the Poisson tail is negligible.
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: probability of finding the promotor at the ON state
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :k: upper bound of summation
+    :returns: 3-tuple with H, H_ON and H_OFF
+    """
+    n = np.arange(min(k, math.ceil(N + 12*math.sqrt(N) + 40)) + 1)
+    log_dists = log_dist_external(epsilon, palpha, N, n)
+    res = []
+    for log_p, norm in zip(log_dists, (1, palpha, 1 - palpha)):
+        if norm == 0:  # entropy conditional to an impossible promoter state is undefined
+            res.append(math.nan)
+            continue
+        log_p = log_p - math.log(norm)  # conditional distributions
+        p = np.exp(log_p)
+        with np.errstate(invalid='ignore'):
+            res.append(-compensated_sum(np.where(p > 0, p*log_p, 0))/LOG2)
+    return tuple(res)
+
+
+def H_external_grad(epsilon, palpha, N, k=math.inf):
+    """Shannon entropies of the externally regulated gene and their derivatives, in bits.
+
+    The derivatives come from those of the logarithms of the conditional
+    distributions (see 'log_dist_external_grad'), in the same pass over n:
+
+        ∂H/∂θ = -∑ pₙ⋅∂log(pₙ)/∂θ⋅(log₂(pₙ) + 1/ln(2))
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: probability of finding the promotor at the ON state, 0 < pₐ < 1
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :k: upper bound of summation
+    :returns: 3-tuple with H, H_ON and H_OFF, and array of shape (3, 3) with their
+        derivatives (rows) with respect to ε, pₐ and N (columns)
+    """
+    n = np.arange(min(k, math.ceil(N + 12*math.sqrt(N) + 40)) + 1)
+    x = epsilon*palpha
+    res, grad = [], []
+    for a, b in ((x, epsilon), (1 + x, 1 + epsilon), (x, 1 + epsilon)):  # φₙ, αₙ/pₐ, βₙ/(1 - pₐ)
+        log_p, (d_x, d_y, d_N) = _log_dist_grad(a, b, N, n)
+        dlog_p = np.stack([palpha*d_x + d_y, epsilon*d_x, d_N])
+        p = np.exp(log_p)
+        with np.errstate(invalid='ignore'):
+            res.append(-compensated_sum(np.where(p > 0, p*log_p, 0))/LOG2)
+            terms = np.where(p > 0, p*dlog_p*(log_p + 1), 0)
+        grad.append([-compensated_sum(t)/LOG2 for t in terms])
+    return tuple(res), np.array(grad)
+
+
+def I_external_grad(epsilon, palpha, N, k=math.inf):
+    """Mutual information of the externally regulated gene and its derivatives, in bits.
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: probability of finding the promotor at the ON state, 0 < pₐ < 1
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :k: upper bound of summation
+    :returns: I and array with its derivatives with respect to ε, pₐ and N
+    """
+    (H, H_ON, H_OFF), grad = H_external_grad(epsilon, palpha, N, k)
+    I = H - palpha*H_ON - (1 - palpha)*H_OFF
+    grad_I = grad[0] - palpha*grad[1] - (1 - palpha)*grad[2]
+    grad_I[1] += H_OFF - H_ON
+    return I, grad_I
+
+
+def compensated_sum(x, axis=-1):
+    """Sum with compensation of the rounding errors, for terms of varying magnitudes.
+
+    Floating point arrays are summed with 'math.fsum' (exactly rounded) if 1-D, and
+    with Neumaier's algorithm along 'axis' otherwise.  Other sequences (e.g. of
+    SymPy or mpmath numbers) are summed with Neumaier's algorithm in their own
+    arithmetic, preserving their precision.
+
+    :x: sequence or array of terms
+    :axis: axis of the array to sum along
+    :returns: the sum
+    """
+    if not isinstance(x, np.ndarray) or x.dtype == object:
+        terms = iter(x)
+        total = next(terms, 0)
+        compensation = 0
+        for term in terms:
+            t = total + term
+            compensation += (total - t) + term if abs(total) >= abs(term) else (term - t) + total
+            total = t
+        return total + compensation
+    if x.ndim == 1:
+        return math.fsum(x)
+    x = np.moveaxis(x, axis, 0)
+    total = np.zeros(x.shape[1:])
+    compensation = np.zeros(x.shape[1:])
+    for term in x:
+        t = total + term
+        compensation += np.where(np.abs(total) >= np.abs(term), (total - t) + term, (term - t) + total)
+        total = t
+    return total + compensation
+
+
+def poisson(lamda, n):
+    """Poisson probability mass function.
+
+    :lamda: mean of the distribution
+    :n: (array of) number(s) of events
+    :returns: probabilities of 'n' events
+    """
+    n = np.asarray(n, dtype=np.float64)
+    return np.exp(xlogy(n, lamda) - lamda - gammaln(n + 1))
+
+
+def log_dist_external(epsilon, palpha, N, n):
+    """Logarithms of the steady-state distributions of the externally regulated gene.
+
+    Vectorized version of 'phi_n_external', 'alpha_n_external' and 'beta_n_external'
+    from the 'steady_state' module, evaluated in log space for a whole range of n.
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: probability of finding the promotor at the ON state
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :n: (array of) number(s) of gene products
+    :returns: 3-tuple of arrays with log(φₙ), log(αₙ) and log(βₙ)
+    """
+    n = np.asarray(n, dtype=np.float64)
+    x = epsilon*palpha
+    with np.errstate(divide='ignore'):
+        log_phi = _log_dist(x, epsilon, N, n)
+        log_alpha = np.log(palpha) + _log_dist(1 + x, 1 + epsilon, N, n)
+        log_beta = np.log(1 - palpha) + _log_dist(x, 1 + epsilon, N, n)
+    return log_phi, log_alpha, log_beta
+
+
+def log_dist_external_grad(epsilon, palpha, N, n):
+    """Logarithms of the steady-state distributions and their derivatives with respect to the parameters.
+
+    The derivatives of the Kummer functions come from differentiating the
+    recurrence that evaluates them, and those of the Pochhammer symbols are
+    differences of digamma functions, ∂log((x)ₙ)/∂x = ψ(x + n) - ψ(x).
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: probability of finding the promotor at the ON state, 0 < pₐ < 1
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :n: (array of) number(s) of gene products
+    :returns: 3-tuple of pairs for φₙ, αₙ and βₙ, each with the array of logarithms and the
+        array of shape (3,) + n.shape of their derivatives with respect to ε, pₐ and N
+    """
+    n = np.asarray(n, dtype=np.float64)
+    x = epsilon*palpha
+    res = []
+    for a, b, log_scale, dlog_scale in ((x, epsilon, 0., 0.),
+                                        (1 + x, 1 + epsilon, math.log(palpha), 1/palpha),
+                                        (x, 1 + epsilon, math.log(1 - palpha), -1/(1 - palpha))):
+        log_p, (d_x, d_y, d_N) = _log_dist_grad(a, b, N, n)
+        res.append((log_scale + log_p, np.stack([palpha*d_x + d_y, epsilon*d_x + dlog_scale, d_N])))
+    return tuple(res)
+
+
+def dist_external(epsilon, palpha, N, n):
+    """Steady-state distributions of the externally regulated gene.
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: probability of finding the promotor at the ON state
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :n: (array of) number(s) of gene products
+    :returns: 3-tuple of arrays with φₙ, αₙ and βₙ
+    """
+    return tuple(np.exp(log_p) for log_p in log_dist_external(epsilon, palpha, N, n))
+
+
+### Internals ###
+
+# Maximum number of elements in temporary arrays of series terms.
+_BLOCK_SIZE = 2**22
+
+def _log_pochhammer(x, n):
+    """Logarithm of the Pochhammer symbol (x)ₙ for x >= 0."""
+    if x == 0:
+        return np.where(n == 0, 0., -np.inf)
+    return gammaln(x + n) - gammaln(x)
+
+# Coefficients of the Stirling series of log(n!) - log(√(2πn)⋅(n/e)ⁿ), in powers of 1/n.
+_STIRLING_SERIES = (1/12, -1/360, 1/1260, -1/1680, 1/1188, -691/360360, 1/156, -3617/122400)
+_STIRLING_MIN = 15  # n from which the series is used
+
+# Iterations of the series of '_bd0', for |x - M| < 0.1⋅(x + M).
+_BD0_TERMS = 10
+
+def _log_poisson(lamda, n):
+    """Logarithm of the Poisson distribution, accurate to a few ulps of its magnitude.
+
+    log(pₙ) = -log(√(2πn)) - stirlerr(n) - bd0(n, λ), as in Loader, "Fast and
+    accurate computation of binomial probabilities" (2000), avoids the
+    cancellation of n⋅log(λ) - λ - log(n!) in the bulk of the distribution.
+    """
+    n = np.asarray(n, dtype=np.float64)
+    lamda = np.asarray(lamda, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m = np.maximum(n, 1)
+        stirlerr = np.where(n < _STIRLING_MIN,
+                            gammaln(m + 1) - (m + 0.5)*np.log(m) + m - 0.5*math.log(2*math.pi),
+                            sum(c/m**(2*i + 1) for i, c in enumerate(_STIRLING_SERIES)))
+        res = -0.5*np.log(2*math.pi*m) - stirlerr - _bd0(n, lamda)
+    return np.where(n == 0, -lamda, res)
+
+def _bd0(x, M):
+    """Deviance term x⋅log(x/M) + M - x, without cancellation for x close to M."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        direct = xlogy(x, x/M) + M - x
+        v = (x - M)/(x + M)
+        res = (x - M)*v
+        term = 2*x*v
+        for j in range(1, _BD0_TERMS + 1):
+            term = term*v*v
+            res = res + term/(2*j + 1)
+    return np.where(np.abs(x - M) < 0.1*(x + M), res, direct)
+
+def _log_kummer(a, b, z):
+    """Logarithm of the Kummer function M(a, b, z) for 0 <= a <= b and z >= 0.
+
+    All terms of the series are positive and, as (a)ₖ/(b)ₖ <= 1, bounded by the
+    Poisson terms zᵏ/k!, which gives a safe truncation point.
+    """
+    b = np.asarray(b, dtype=np.float64)
+    k = math.ceil(z + 12*math.sqrt(z) + 40)
+    j = np.arange(k)
+    res = np.empty_like(b)
+    block = max(1, _BLOCK_SIZE//k)
+    for start in range(0, b.size, block):
+        b_block = b.ravel()[start:start + block, np.newaxis]
+        with np.errstate(divide='ignore'):
+            log_ratios = np.log(a + j) - np.log(b_block + j) + np.log(z) - np.log(j + 1)
+        log_terms = np.cumsum(log_ratios, axis=-1)
+        log_terms = np.concatenate([np.zeros_like(b_block), log_terms[:, :-1]], axis=-1)
+        res.ravel()[start:start + block] = logsumexp(log_terms, axis=-1)
+    return res
+
+def _log_kummer_range(a, b, z, m):
+    """Logarithms of M(a, b + i, z) for i = 0, 1, ..., m - 1, with 0 <= a <= b and z >= 0.
+
+    Only the two last values are computed from the series, the others follow from
+    the backward recurrence (stable for this minimal solution) of the ratios
+    rᵢ = M(a, b + i, z)/M(a, b + i + 1, z), derived from the contiguous relation:
+
+        (b+1)⋅b⋅M(a, b) - (b+1)⋅(b+z)⋅M(a, b+1) + z⋅(b+1-a)⋅M(a, b+2) = 0
+    """
+    top = b + m - 1
+    log_top = _log_kummer(a, [top, top + 1], z)
+    ratio = math.exp(log_top[0] - log_top[1])
+    log_ratios = np.empty(m)
+    log_ratios[-1] = log_top[0]
+    for i in range(m - 2, -1, -1):
+        b_i = b + i
+        ratio = ((b_i + 1)*(b_i + z) - z*(b_i + 1 - a)/ratio)/((b_i + 1)*b_i)
+        log_ratios[i] = math.log(ratio)
+    return _compensated_cumsum(log_ratios[::-1])[::-1]
+
+def _log_kummer_grad(a, b, z):
+    """Logarithm of M(a, b, z) and its derivatives with respect to a, b and z, for 0 < a <= b and z >= 0.
+
+    The series is truncated as in '_log_kummer'.  With the normalized terms
+    wₖ, ∂log(M)/∂a = Σ wₖ⋅(ψ(a + k) - ψ(a)), and similarly for b and z.
+    """
+    k = math.ceil(z + 12*math.sqrt(z) + 40)
+    j = np.arange(k)
+    with np.errstate(divide='ignore'):
+        log_ratios = np.log(a + j) - np.log(b + j) + np.log(z) - np.log(j + 1)
+    log_terms = np.concatenate([[0.], np.cumsum(log_ratios)[:-1]])
+    res = logsumexp(log_terms)
+    w = np.exp(log_terms - res)
+    harmonic_a = np.concatenate([[0.], np.cumsum(1/(a + j))[:-1]])  # ψ(a + k) - ψ(a)
+    harmonic_b = np.concatenate([[0.], np.cumsum(1/(b + j))[:-1]])
+    return res, np.array([w @ harmonic_a, -(w @ harmonic_b), (w @ j)/z if z > 0 else 0.])
+
+def _log_kummer_range_grad(a, b, z, m):
+    """Logarithms of M(a, b + i, z) for i = 0, 1, ..., m - 1 and their derivatives with respect to a, b and z.
+
+    Forward differentiation of the backward recurrence of '_log_kummer_range'.
+    :returns: array of shape (m,) and array of shape (3, m)
+    """
+    top = b + m - 1
+    log_top0, grad_top0 = _log_kummer_grad(a, top, z)
+    log_top1, grad_top1 = _log_kummer_grad(a, top + 1, z)
+    ratio = math.exp(log_top0 - log_top1)
+    d_a, d_b, d_z = (ratio*(grad_top0 - grad_top1)).tolist()
+    ratios, derivatives = [], []
+    for i in range(m - 2, -1, -1):
+        b_i = b + i
+        previous = ratio
+        c = z*(b_i + 1 - a)/previous
+        den = (b_i + 1)*b_i
+        ratio = ((b_i + 1)*(b_i + z) - c)/den
+        dc = c/previous  # -∂c/∂ratio
+        d_a = (z/previous + dc*d_a)/den
+        d_b = (2*b_i + 1 + z - z/previous + dc*d_b - ratio*(2*b_i + 1))/den
+        d_z = (b_i + 1 - (b_i + 1 - a)/previous + dc*d_z)/den
+        ratios.append(ratio)
+        derivatives.append((d_a, d_b, d_z))
+    ratios = np.array(ratios[::-1]).reshape(m - 1)
+    log_ratios = np.append(np.log(ratios), log_top0)
+    dlog_ratios = np.column_stack([np.array(derivatives[::-1]).reshape(m - 1, 3).T/ratios, grad_top0])
+    log_M = _compensated_cumsum(log_ratios[::-1])[::-1]
+    dlog_M = np.cumsum(dlog_ratios[:, ::-1], axis=-1)[:, ::-1]
+    return log_M, dlog_M
+
+def _compensated_cumsum(x):
+    """Cumulative sum of a 1-D array with Neumaier's compensation of rounding errors."""
+    res = np.empty_like(x)
+    total = compensation = 0.
+    for i, term in enumerate(x.tolist()):
+        t = total + term
+        compensation += (total - t) + term if abs(total) >= abs(term) else (term - t) + total
+        total = t
+        res[i] = total + compensation
+    return res
+
+def _log_dist(x, y, N, n):
+    """Logarithm of 'steady_state.dist' after Kummer's transformation:
+
+               n
+              N  (x)ₙ  -N
+    dist(n) = ──⋅────⋅e  ⋅M(y - x, y + n, N)
+              n! (y)ₙ
+    """
+    n_max = int(n.max(initial=0))
+    log_kummer = _log_kummer_range(y - x, y, N, n_max + 1)[n.astype(int)]
+    log_const = xlogy(n, N) - gammaln(n + 1) - N
+    log_ratio = _log_pochhammer(x, n) - _log_pochhammer(y, n)
+    return log_const + log_ratio + log_kummer
+
+def _log_dist_grad(x, y, N, n):
+    """'_log_dist' and its derivatives with respect to x, y and N, for x > 0.
+
+    :returns: array of logarithms and array of shape (3,) + n.shape of derivatives
+    """
+    log_M, dlog_M = _log_kummer_range_grad(y - x, y, N, int(n.max(initial=0)) + 1)
+    index = n.astype(int)
+    res = xlogy(n, N) - gammaln(n + 1) - N + _log_pochhammer(x, n) - _log_pochhammer(y, n) + log_M[index]
+    dM_da, dM_db, dM_dz = dlog_M[:, index]  # M(a, b, z) with a = y - x, b = y + n and z = N
+    d_x = digamma(x + n) - digamma(x) - dM_da
+    d_y = digamma(y) - digamma(y + n) + dM_da + dM_db
+    d_N = n/N - 1 + dM_dz
+    return res, np.stack([d_x, d_y, d_N])
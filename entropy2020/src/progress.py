@@ -0,0 +1,204 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Progress and time estimates of long calculations.
+
+A Progress object counts the points of a calculation (e.g. a sweep) that were
+found in the cache, computed, failed or are being computed by the workers, per
+backend (calculation method: points are pending in the method they were
+submitted with and computed in the one that succeeded, e.g. a backup method),
+and the peak memory used by a worker on a point.
+The time remaining is estimated from the mean cost of the points computed by
+each backend and the number of workers, so that the effect of adding workers
+can be judged.  Progress is shown in a single status line and, optionally, appended as JSON objects (one per line) to a file.
+
+Example:
+    >>> progress = Progress(total=100, name='sweep', workers=4, file='progress.jsonl')
+    >>> progress.cached(40)
+    >>> progress.submitted('sympy', 60)
+    >>> progress.completed('sympy', seconds=2.5, memory=300e6)
+    >>> progress.close()
+"""
+
+__all__ = ['FILE', 'Progress']
+
+import json
+import logging
+import sys
+import threading
+import time
+from collections import defaultdict
+
+
+# Default file name for progress records.
+FILE = 'progress.jsonl'
+
+# Minimum seconds between reports (status line and file records).
+INTERVAL = 1.0
+
+
+class Progress:
+    """Counters and time estimate of a set of points, per backend.
+
+    Thread safe: counters may be updated from pool callbacks.
+
+    :total: total number of points, including those found in the cache
+    :name: label of the calculation, used in reports
+    :workers: number of worker processes computing the points
+    :file: path of a file to append progress records (JSON Lines) to, or None
+    :stream: text stream for the status line, default is sys.stderr if the log
+        level is INFO or higher (less verbose), pass None to disable
+    """
+    def __init__(self, total, name='', workers=1, file=None, stream='default'):
+        self.total = total
+        self.name = name
+        self.workers = workers
+        self.file = file
+        if stream == 'default':
+            stream = sys.stderr if logging.getLogger().level >= logging.INFO else None
+        self.stream = stream
+        self.start = time.time()
+        self.n_cached = 0
+        self.backends = defaultdict(lambda: {'pending': 0, 'done': 0, 'failed': 0, 'seconds': 0.0,
+                                             'peak_memory': None})
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+        self._line_length = 0
+
+    def cached(self, n=1):
+        """Count points found in the cache."""
+        with self._lock:
+            self.n_cached += n
+        self.report()
+
+    def submitted(self, backend, n=1):
+        """Count points sent to the workers."""
+        with self._lock:
+            self.backends[backend]['pending'] += n
+        self.report()
+
+    def completed(self, backend, seconds, failed=False, memory=None, requested=None):
+        """Count a point computed by a worker.
+
+        :backend: calculation method that computed the point (e.g. a backup method)
+        :seconds: time spent by the worker on the point
+        :failed: whether the calculation failed (all methods returned None)
+        :memory: peak memory of the worker on the point, in bytes, or None if unknown
+        :requested: method the point was submitted with, if other than 'backend'
+        """
+        with self._lock:
+            self.backends[requested or backend]['pending'] -= 1
+            counts = self.backends[backend]
+            counts['failed' if failed else 'done'] += 1
+            counts['seconds'] += seconds
+            if memory is not None:
+                counts['peak_memory'] = max(counts['peak_memory'] or 0, memory)
+        self.report()
+
+    def summary(self):
+        """Dictionary with the current counters, costs and time estimate."""
+        with self._lock:
+            backends = {}
+            for backend, counts in self.backends.items():
+                computed = counts['done'] + counts['failed']
+                backends[backend] = dict(counts, mean_seconds=counts['seconds']/computed if computed else None)
+        done = sum(b['done'] for b in backends.values())
+        failed = sum(b['failed'] for b in backends.values())
+        pending = sum(b['pending'] for b in backends.values())
+        return {
+            'name': self.name,
+            'time': time.time(),
+            'elapsed': time.time() - self.start,
+            'total': self.total,
+            'cached': self.n_cached,
+            'done': done,
+            'failed': failed,
+            'in_flight': min(pending, self.workers),
+            'queued': max(pending - self.workers, 0),
+            'remaining': self.total - self.n_cached - done - failed,
+            'workers': self.workers,
+            'eta': self._eta(backends, self.total - self.n_cached - done - failed),
+            'backends': backends,
+        }
+
+    def report(self, force=False):
+        """Show the status line and write a record to the file, at most once per INTERVAL seconds."""
+        with self._lock:
+            now = time.time()
+            if not force and now - self._last_report < INTERVAL:
+                return
+            self._last_report = now
+        summary = self.summary()
+        if self.stream is not None:
+            line = "{name}: {done}/{total} computed ({cached} cached, {failed} failed, {in_flight} in flight)".format(
+                **dict(summary, total=summary['total'] - summary['cached']))
+            costs = ", ".join("{} {:.3g} s/point".format(b, c['mean_seconds'])
+                              + ("" if c['peak_memory'] is None else " {} peak".format(_format_bytes(c['peak_memory'])))
+                              for b, c in sorted(summary['backends'].items()) if c['mean_seconds'] is not None)
+            if costs:
+                line += ", " + costs
+            if summary['eta'] is not None:
+                line += ", ETA " + _format_seconds(summary['eta'])
+            print("\r" + line.ljust(self._line_length), end="", file=self.stream, flush=True)
+            self._line_length = len(line)
+        if self.file is not None:
+            with open(self.file, 'a') as file:
+                print(json.dumps(summary, sort_keys=True), file=file)
+
+    def close(self):
+        """Write the final report and end the status line."""
+        self.report(force=True)
+        if self.stream is not None:
+            print(file=self.stream, flush=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _eta(self, backends, remaining):
+        """Seconds remaining: pending points times their backend's mean cost, divided among the workers."""
+        if not any(b['pending'] for b in backends.values()):
+            return None if remaining > 0 else 0.0  # points not submitted yet
+        computed = sum(b['done'] + b['failed'] for b in backends.values())
+        if not computed:
+            return None  # no cost observed yet
+        # Points of a method whose points all went to other (backup) methods cost the overall mean.
+        overall = sum(b['seconds'] for b in backends.values())/computed
+        work = sum(b['pending']*(b['mean_seconds'] or overall) for b in backends.values() if b['pending'])
+        return work/self.workers
+
+
+### Internals ###
+
+def _format_bytes(n_bytes):
+    """Format a size as e.g. '512 kB', '1.2 GB'."""
+    for unit in ('B', 'kB', 'MB', 'GB'):
+        if n_bytes < 1000:
+            break
+        n_bytes /= 1000
+    else:
+        unit = 'TB'
+    return "{:.3g} {}".format(n_bytes, unit)
+
+def _format_seconds(seconds):
+    """Format a duration as e.g. '1h02m', '3m05s' or '12s'."""
+    seconds = int(round(seconds))
+    hours, minutes, seconds = seconds//3600, seconds//60 % 60, seconds % 60
+    if hours:
+        return "{}h{:02d}m".format(hours, minutes)
+    if minutes:
+        return "{}m{:02d}s".format(minutes, seconds)
+    return "{}s".format(seconds)
@@ -0,0 +1,129 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Reparameterizations of the externally regulated gene model.
+
+Vectorized closed-form maps between the model parameters (ε, pₐ, N) and the
+physically meaningful parametrizations (ε, pₐ, <n>), (ε, pₐ, <nₐ>) and
+(<n>, F), where F is the Fano factor and either ε or pₐ is also given.  The
+expressions and their inverses come from the 'steady_state' module, through the
+'compiled' module.  All functions accept scalars or arrays (broadcast together)
+and return a tuple of float arrays (0-dimensional for scalars).  Points that are
+not finite or have no (finite) image in the model's domain raise ValueError.
+
+Example (a sweep along the Fano factor at fixed mean):
+    >>> epsilon, palpha, N = reparam.from_mu_fano(50, np.logspace(0, 3), palpha=0.1)
+"""
+
+__all__ = [
+        'from_mu', 'from_mu_alpha', 'from_mu_fano',
+        'to_mu', 'to_mu_alpha', 'to_mu_fano',
+]
+
+import numpy as np
+
+import compiled
+
+
+def to_mu(epsilon, palpha, N):
+    """Map (ε, pₐ, N) to (ε, pₐ, <n>)."""
+    epsilon, palpha, N = _validate(epsilon, palpha, N)
+    return _broadcast(epsilon, palpha, compiled.lambdified('mu_external')(epsilon, palpha, N))
+
+def from_mu(epsilon, palpha, mu):
+    """Map (ε, pₐ, <n>) to (ε, pₐ, N)."""
+    epsilon, palpha, mu = _broadcast(epsilon, palpha, mu)
+    N = compiled.inverse('mu_external', 'N')(epsilon=epsilon, p_a=palpha, mu_external=mu)
+    return _validate(epsilon, palpha, N, given=(('epsilon', epsilon), ('palpha', palpha), ('mu', mu)))
+
+
+def to_mu_alpha(epsilon, palpha, N):
+    """Map (ε, pₐ, N) to (ε, pₐ, <nₐ>)."""
+    epsilon, palpha, N = _validate(epsilon, palpha, N)
+    return _broadcast(epsilon, palpha, compiled.lambdified('mu_alpha_external')(epsilon, palpha, N))
+
+def from_mu_alpha(epsilon, palpha, mu_alpha):
+    """Map (ε, pₐ, <nₐ>) to (ε, pₐ, N)."""
+    epsilon, palpha, mu_alpha = _broadcast(epsilon, palpha, mu_alpha)
+    N = compiled.inverse('mu_alpha_external', 'N')(epsilon=epsilon, p_a=palpha, mu_alpha_external=mu_alpha)
+    return _validate(epsilon, palpha, N, given=(('epsilon', epsilon), ('palpha', palpha), ('mu_alpha', mu_alpha)))
+
+
+def to_mu_fano(epsilon, palpha, N):
+    """Map (ε, pₐ, N) to (<n>, F)."""
+    epsilon, palpha, N = _validate(epsilon, palpha, N)
+    mu = compiled.lambdified('mu_external')(epsilon, palpha, N)
+    fano = compiled.lambdified('fano_external')(epsilon, palpha, N)
+    return _broadcast(mu, fano)
+
+def from_mu_fano(mu, fano, epsilon=None, palpha=None):
+    """Map (<n>, F) plus either ε or pₐ to (ε, pₐ, N).
+
+    With ε given, pₐ follows from the form of the Fano factor in terms of the mean:
+
+                N - <n>
+        F = 1 + ───────  ⇒  N = <n> + (F - 1)⋅(1 + ε)
+                 1 + ε
+
+    :mu: mean number of gene products <n>
+    :fano: Fano factor F >= 1
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: probability of finding the promotor at the ON state
+    :returns: 3-tuple of arrays with ε, pₐ and N
+    """
+    if (epsilon is None) == (palpha is None):
+        raise TypeError("from_mu_fano() requires exactly one of 'epsilon' or 'palpha'")
+    if epsilon is None:
+        palpha, mu, fano = _broadcast(palpha, mu, fano)
+        given = (('mu', mu), ('fano', fano), ('palpha', palpha))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            N = compiled.inverse('mu_external', 'N')(epsilon=None, p_a=palpha, mu_external=mu)
+            epsilon = compiled.inverse('fano_external', 'epsilon')(fano_external=fano, p_a=palpha, N=N)
+    else:
+        epsilon, mu, fano = _broadcast(epsilon, mu, fano)
+        given = (('mu', mu), ('fano', fano), ('epsilon', epsilon))
+        N = mu + (fano - 1)*(1 + epsilon)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            palpha = compiled.inverse('mu_external', 'p_a')(epsilon=epsilon, mu_external=mu, N=N)
+    return _validate(epsilon, palpha, N, given)
+
+
+### Internals ###
+
+def _broadcast(*args):
+    """Convert arguments to float arrays of the same shape."""
+    return tuple(np.array(a, dtype=np.float64) for a in np.broadcast_arrays(*args))
+
+def _validate(epsilon, palpha, N, given=None):
+    """Check that parameters (broadcast together) are finite and inside the model's domain.
+
+    :given: pairs (name, values) of the arguments of an inverse map, to name the
+        first infeasible point in the error message
+    """
+    epsilon, palpha, N = _broadcast(epsilon, palpha, N)
+    checks = (
+        (~(np.isfinite(epsilon) & np.isfinite(palpha) & np.isfinite(N)), "parameters must be finite"),
+        (epsilon <= 0, "epsilon must be > 0"),
+        ((palpha <= 0) | (palpha > 1), "palpha must be in the interval (0, 1]"),
+        (N <= 0, "N must be > 0"),
+    )
+    for invalid, message in checks:
+        if np.any(invalid):
+            if given is not None:
+                index = np.unravel_index(np.argmax(invalid), invalid.shape)
+                point = ", ".join("{} = {:g}".format(name, np.broadcast_to(values, invalid.shape)[index])
+                                  for name, values in given)
+                message = "infeasible point ({}): {}".format(point, message)
+            raise ValueError(message)
+    return epsilon, palpha, N
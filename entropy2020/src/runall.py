@@ -12,13 +12,110 @@
 # Created:  29-07-2019
 # Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
 
+"""
+Generate all figures.
+
+Usage:
+    runall.py [-eps|-png] [-concurrent] [-force] [-progress] [-memory=GB]
+
+Only figures whose configuration, code or output files changed since the last
+run are regenerated (see the 'build' module), unless '-force' is given.  With
+'-eps', the figures are also converted and appended by 'compile_eps.sh', if
+any of them changed.
+With '-concurrent', the entropy calculations of all figures are submitted to a
+single pool of worker processes, and each figure script is run in its own
+process as soon as the points of its sweeps are in the cache (adaptive axes are
+refined in the same pool), while the pool computes the points of the next
+figures.  With '-progress', progress records of the calculations are appended
+to the file 'progress.jsonl' (see the 'progress' module).  With '-memory', each
+worker process is limited to that many gigabytes (see
+'entropy.set_memory_limit'), points exceeding it are put in quarantine.
+"""
+
 import os
+import subprocess
 import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
 from runpy import run_path
 from subprocess import check_call
 
-old_files = glob('fig_*.eps') + glob('fig_*.png')
+import build
+import entropy
+import progress
+import sweep
+
+# Seconds between checks of the jobs of pending figures.
+POLL_INTERVAL = 0.5
+
+
+def run_concurrently(scripts, args, state, progress_file=None):
+    """Run figure scripts in parallel processes, sharing a pool for their calculations."""
+    figures = [os.path.splitext(script)[0] for script in scripts]
+    sweeps = sweep.load(figures=figures)
+
+    # Figures with fewer calculations are scheduled (and plotted) first.
+    size = {figure: sum(len(s.tasks()) for (fig, _), s in sweeps.items() if fig == figure) for figure in figures}
+    figures.sort(key=size.get)
+    sweeps = OrderedDict((key, s) for figure in figures for key, s in sweeps.items() if key[0] == figure)
+
+    workers = os.cpu_count()
+    with sweep.worker_pool(workers) as pool, progress.Progress(0, 'runall', workers, progress_file) as status, \
+            ThreadPoolExecutor() as refiner:
+        jobs = sweep.submit(sweeps, pool, status)
+        pending = OrderedDict((figure, [job for key, sweep_jobs in jobs.items() if key[0] == figure
+                                        for job in sweep_jobs]) for figure in figures)
+        refining = {}
+        processes = OrderedDict()
+        while pending:
+            for figure, figure_jobs in list(pending.items()):
+                if not all(job.ready() for job in figure_jobs):
+                    continue
+                # Adaptive axes are refined in the shared pool too, then the figure finds them cached.
+                adaptive = OrderedDict((key, s) for key, s in sweeps.items() if key[0] == figure and s.refine)
+                if adaptive and figure not in refining:
+                    refining[figure] = refiner.submit(sweep.run, adaptive, workers, progress_file, pool)
+                if figure in refining:
+                    if not refining[figure].done():
+                        continue
+                    refining.pop(figure).result()
+                print("\n>> Running", figure + '.py', flush=True)
+                processes[figure] = (subprocess.Popen([sys.executable, figure + '.py'] + args), time.time())
+                del pending[figure]
+            if pending:
+                status.report()
+                time.sleep(POLL_INTERVAL)
+
+        failed = []
+        for figure, (process, start) in processes.items():
+            if process.wait() == 0:
+                state.update(figure, start)
+            else:
+                failed.append(figure)
+    if failed:
+        sys.exit(">> Failed figures: " + " ".join(failed))
+
+
+flags = {flag: flag in sys.argv for flag in ('-concurrent', '-force', '-progress')}
+memory = [arg for arg in sys.argv if arg.startswith('-memory=')]
+sys.argv = [arg for arg in sys.argv if arg not in flags and arg not in memory]
+if memory:
+    entropy.set_memory_limit(int(float(memory[-1].partition('=')[2])*1e9))
+
+from __init__ import config, term
+
+progress_file = progress.FILE if flags['-progress'] else None
+
+state = build.State(config, term)
+scripts = [script for script in sorted(glob('fig_*.py'))
+           if flags['-force'] or state.stale(os.path.splitext(script)[0])]
+if not scripts:
+    print(">> All figures are up to date.")
+
+old_files = [file for script in scripts for ext in ('eps', 'png')
+             for file in glob('{}*.{}'.format(os.path.splitext(script)[0], ext))]
 if old_files:
     message = ">> These old files were found and may cause errors:"
     prompt = ">> Should they be removed before running? [y/N] "
@@ -28,13 +125,20 @@ if old_files:
             os.remove(file)
         print(">> Files removed.")
 
-for script in sorted(glob('fig_*.py')):
-    print("\n>> Running", script)
-    run_path(script)
+if flags['-concurrent']:
+    run_concurrently(scripts, sys.argv[1:], state, progress_file)
+elif scripts:
+    # Points shared by different figures are computed only once.
+    print("\n>> Evaluating sweeps of stale figures")
+    sweep.run(sweep.load(figures=[os.path.splitext(script)[0] for script in scripts]), progress_file=progress_file)
+
+    for script in scripts:
+        print("\n>> Running", script)
+        start = time.time()
+        run_path(script)
+        state.update(os.path.splitext(script)[0], start)
 
-try:
-    if sys.argv[1] == '-eps':
-        print("\n>> Converting and appending images...")
-        check_call('bash -x compile_eps.sh 2>&1 | grep -v "^+ for"', shell=True)
-except IndexError:
-    pass
+if sys.argv[1:2] == ['-eps'] and state.stale_compile():
+    print("\n>> Converting and appending images...")
+    check_call('bash -x compile_eps.sh 2>&1 | grep -v "^+ for"', shell=True)
+    state.update_compile()
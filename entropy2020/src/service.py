@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Local HTTP service exposing the entropy calculations, and its client.
+
+The server keeps one process with the expressions loaded, the caches open and
+a pool of workers (see 'entropy_async'), so that other programs get cached
+points in milliseconds without importing SymPy.  Requests are JSON objects
+{"method": name, "params": {...}}, or lists of them (a batch), posted to '/'.
+Concurrent requests for the same point (parameters equal up to DEDUP_DIGITS
+significant digits) are coalesced into a single calculation, and distribution
+requests arriving within BATCH_WINDOW seconds for the same parameters are
+evaluated together, over the union of their 'n' values.
+
+Methods: H_external, H_ON_external, H_OFF_external and I_external (parameters
+of the functions in 'entropy_async'), H_constitutive (N, precision) and
+dist_external (epsilon, palpha, N and a list n, returns [phi, alpha, beta]).
+
+Usage:
+    service.py [port]
+
+Example (client):
+    >>> client = Client()
+    >>> client.H_external(2, 0.5, 10)
+    3.7455244356697563
+    >>> client.batch([('H_external', {'epsilon': e, 'palpha': 0.5, 'N': 10}) for e in (0.5, 1, 2)])
+    [3.6599394284402607, 3.774363191297971, 3.7455244356697563]
+"""
+
+__all__ = ['Client', 'Server', 'ServiceError', 'serve']
+
+import asyncio
+import json
+import logging
+import math
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+import entropy
+import entropy_async
+import numeric
+
+
+HOST = '127.0.0.1'
+PORT = 8020
+
+# Significant digits of parameters when coalescing requests.
+DEDUP_DIGITS = 12
+
+# Seconds to wait for other distribution requests with the same parameters.
+BATCH_WINDOW = 0.005
+
+ENTROPY_METHODS = {
+    'H_external': entropy_async.H_external_async,
+    'H_ON_external': entropy_async.H_ON_external_async,
+    'H_OFF_external': entropy_async.H_OFF_external_async,
+    'I_external': entropy_async.I_external_async,
+}
+METHODS = tuple(ENTROPY_METHODS) + ('H_constitutive', 'dist_external')
+
+
+class ServiceError(Exception):
+    """Error returned by the service for a request."""
+
+
+class Server:
+    """Entropy service, with request coalescing and batching.
+
+    :host: interface to listen on, default is the loopback
+    :port: TCP port
+    """
+    def __init__(self, host=HOST, port=PORT):
+        self.host = host
+        self.port = port
+        self.inflight = {}  # point -> Task
+        self.dist_batches = {}  # (epsilon, palpha, N) -> list of (n, Future)
+
+    async def call(self, method, params):
+        """Evaluate a method, sharing the calculation with concurrent identical requests."""
+        if method not in METHODS:
+            raise ServiceError("unknown method {!r}, expected one of {}".format(method, ", ".join(METHODS)))
+        if method == 'dist_external':
+            return await self._dist_external(**params)
+
+        key = (method,) + tuple(sorted((k, _round(v)) for k, v in params.items()))
+        task = self.inflight.get(key)
+        if task is None:
+            if method == 'H_constitutive':
+                calculation = asyncio.get_running_loop().run_in_executor(
+                        None, lambda: float(entropy.H_constitutive(**params)))
+            else:
+                calculation = ENTROPY_METHODS[method](**params)
+            task = self.inflight[key] = asyncio.ensure_future(calculation)
+            task.add_done_callback(lambda _: self.inflight.pop(key, None))
+        res = await asyncio.shield(task)
+        return None if res is None else float(res)
+
+    async def handle(self, request):
+        """Answer a request object or a batch (list) of them."""
+        if isinstance(request, list):
+            return await asyncio.gather(*(self.handle(r) for r in request))
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get('params', {}), dict):
+                raise ServiceError("a request must be an object with 'method' and 'params'")
+            return {'result': await self.call(request.get('method'), request.get('params', {}))}
+        except (ServiceError, TypeError, ValueError) as error:
+            return {'error': "{}: {}".format(type(error).__name__, error)}
+        except Exception as error:  # e.g. MemoryError: fail this request, not the batch or the connection
+            logging.exception("service: request %r failed", request)
+            return {'error': "{}: {}".format(type(error).__name__, error)}
+
+    async def start(self):
+        """Start listening, returns the asyncio.Server."""
+        server = await asyncio.start_server(self._connection, self.host, self.port)
+        logging.info("service: listening on http://%s:%d/", self.host, self.port)
+        return server
+
+    async def _connection(self, reader, writer):
+        """Minimal HTTP/1.1: one JSON POST per connection."""
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            try:
+                length = int(headers.get('content-length', 0))
+            except ValueError:
+                length = None
+            body = await reader.readexactly(length) if length is not None else b''
+
+            if length is None:
+                status, response = '400 Bad Request', {'error': "invalid Content-Length"}
+            elif not request_line.startswith(b'POST '):
+                status, response = '405 Method Not Allowed', {'error': "only POST is supported"}
+            else:
+                try:
+                    response = await self.handle(json.loads(body.decode() or 'null'))
+                    status = '200 OK'
+                except ValueError as error:
+                    status, response = '400 Bad Request', {'error': "invalid JSON: {}".format(error)}
+                except Exception as error:  # the client always gets a response
+                    logging.exception("service: internal error")
+                    status, response = '500 Internal Server Error', {'error': "{}: {}".format(
+                            type(error).__name__, error)}
+
+            payload = json.dumps(response).encode()
+            writer.write("HTTP/1.1 {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n"
+                         "Connection: close\r\n\r\n".format(status, len(payload)).encode() + payload)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dist_external(self, epsilon, palpha, N, n):
+        """Distributions at points n, batched with concurrent requests for the same parameters."""
+        key = (_round(epsilon), _round(palpha), _round(N))
+        future = asyncio.get_running_loop().create_future()
+        batch = self.dist_batches.setdefault(key, [])
+        batch.append((np.asarray(n, dtype=np.int64), future))
+        if len(batch) == 1:
+            asyncio.get_running_loop().call_later(BATCH_WINDOW, self._run_dist_batch, key)
+        return await future
+
+    def _run_dist_batch(self, key):
+        """Evaluate the distributions for the union of the 'n' values of a batch."""
+        batch = self.dist_batches.pop(key)
+        try:
+            n_all = np.unique(np.concatenate([n for n, _ in batch]))
+            dists = numeric.dist_external(*key, n_all)
+            for n, future in batch:
+                index = np.searchsorted(n_all, n)
+                future.set_result([d[index].tolist() for d in dists])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(ServiceError("{}: {}".format(type(error).__name__, error)))
+
+
+class Client:
+    """Client of the entropy service.
+
+    :url: URL of the service
+    :timeout: seconds to wait for an answer, or None to wait indefinitely
+    """
+    def __init__(self, url='http://{}:{}/'.format(HOST, PORT), timeout=None):
+        self.url = url
+        self.timeout = timeout
+
+    def batch(self, calls):
+        """Evaluate several calls in a single request.
+
+        :calls: list of (method, params) pairs
+        :returns: list of results, or of ServiceError instances for failed calls
+        """
+        response = self._post([{'method': m, 'params': p} for m, p in calls])
+        return [r['result'] if 'result' in r else ServiceError(r['error']) for r in response]
+
+    def call(self, method, /, **params):
+        """Evaluate a method of the service, see the module documentation.
+
+        'method' is positional-only, so that the entropy option 'method' can be passed in 'params'.
+        """
+        response = self._post({'method': method, 'params': params})
+        if 'error' in response:
+            raise ServiceError(response['error'])
+        return response['result']
+
+    def H_external(self, epsilon, palpha, N, **options):
+        return self.call('H_external', epsilon=epsilon, palpha=palpha, N=N, **options)
+
+    def H_ON_external(self, epsilon, palpha, N, **options):
+        return self.call('H_ON_external', epsilon=epsilon, palpha=palpha, N=N, **options)
+
+    def H_OFF_external(self, epsilon, palpha, N, **options):
+        return self.call('H_OFF_external', epsilon=epsilon, palpha=palpha, N=N, **options)
+
+    def I_external(self, epsilon, palpha, N, **options):
+        return self.call('I_external', epsilon=epsilon, palpha=palpha, N=N, **options)
+
+    def H_constitutive(self, N, **options):
+        return self.call('H_constitutive', N=N, **options)
+
+    def dist_external(self, epsilon, palpha, N, n):
+        """Distributions φₙ, αₙ and βₙ at the points 'n', as a tuple of arrays."""
+        n = np.asarray(n)
+        res = self.call('dist_external', epsilon=epsilon, palpha=palpha, N=N, n=n.ravel().tolist())
+        return tuple(np.array(d).reshape(n.shape) for d in res)
+
+    def _post(self, payload):
+        data = json.dumps(payload).encode()
+        request = urllib.request.Request(self.url, data, {'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as error:
+            raise ServiceError(json.load(error).get('error', str(error))) from None
+
+
+def serve(host=HOST, port=PORT):
+    """Run the service until interrupted."""
+    async def main():
+        server = await Server(host, port).start()
+        async with server:
+            await server.serve_forever()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        entropy_async.shutdown()
+
+
+### Internals ###
+
+def _round(x):
+    """Round numbers to DEDUP_DIGITS significant digits, so that equal points match."""
+    if isinstance(x, float) and math.isfinite(x):
+        return float('{:.{}g}'.format(x, DEDUP_DIGITS))
+    if isinstance(x, list):
+        return tuple(_round(v) for v in x)
+    return x
+
+
+if __name__ == '__main__':
+    import sys
+
+    logging.basicConfig(format='[%(levelname)s] %(message)s', level=logging.INFO)
+    serve(port=int(sys.argv[1]) if len(sys.argv) > 1 else PORT)
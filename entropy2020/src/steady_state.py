@@ -65,6 +65,11 @@ alpha_n_external = palpha * dist(1 + epsilon*palpha, 1 + epsilon, N, n)
 """
 beta_n_external = (1 - palpha) * dist(epsilon*palpha, 1 + epsilon, N, n)
 
+"""Mean number of gene products.
+    <n> = pₐ⋅N
+"""
+mu_external = palpha*N
+
 """Mean number of gene products at the ON state.
            ε⋅pₐ + 1
     <nₐ> = ────────⋅N
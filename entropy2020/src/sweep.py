@@ -0,0 +1,590 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Declarative parameter sweeps.
+
+Sweeps are declared in the "sweeps" entry of the figures' sections of the
+configuration file, as in the example below.  Each sweep has a list of
+quantities and one axis for each of the parameters ε, pₐ and one of N, <n>
+('mu') or <nₐ> ('mu_alpha'), plus an 'n' axis for distributions.  Values are
+evaluated in the mesh (outer product) of the axes, in the declared order.
+
+    "fig_example": {
+        "mu": 50,
+        "palpha": [0.1, 0.5],
+        "sweeps": {
+            "curves": {
+                "quantities": ["H", "I"],
+                "palpha": "$palpha",
+                "epsilon": {"plot_points": [0.2, 8, 16], "logspace": true, "extra": [2, 10]},
+                "mu": "$mu",
+                "method": "sympy"
+            }
+        }
+    }
+
+Axis values may be a number, a list of values (concatenated), a reference to a
+parameter of the same section ("$name") or a grid, i.e. a dictionary with one of
+the keys 'plot_points' (arguments to 'utils.plot_points' plus the option
+'logspace'), 'linspace' or 'geomspace' (arguments to the NumPy functions), and
+the optional keys 'slice' (start and stop indices), 'extra' (more values, the
+result is sorted) and 'integer' (round up to unique integers).  One axis per
+sweep may be adaptive instead, i.e. a dictionary with the key 'adaptive'
+(arguments 'xmin', 'xmax' and 'min_points' of 'utils.adaptive_points') and the
+optional keys 'logspace', 'tol' and 'max_points': it starts as a coarse
+'plot_points' grid that is refined where the curves of the sweep's entropies
+are poorly interpolated.
+
+Quantities are 'H', 'H_ON', 'H_OFF' and 'I' (entropies, with the optional keys
+'method', 'backup_method' and 'precision') and 'phi', 'alpha' and 'beta'
+(distributions, with the 'n' axis last).  The entropy calculations of all sweeps
+passed to 'run' are merged and deduplicated, and only the points not found in
+the cache are evaluated, once, in a pool of worker processes.  With 'submit',
+the calculations go to a pool shared with other sweeps instead, and the caller
+decides when to wait for them.
+
+Each value is cached as soon as it is computed, so an interrupted run resumes
+where it stopped.  Points whose calculation fails are put in quarantine with the
+reason of the failure and skipped by later runs, until they are recomputed by
+'retry' (possibly with another method or precision), also from the command line:
+
+    sweep.py list | retry [method [precision]]
+
+Workers are limited to the memory set by 'entropy.set_memory_limit', so that a
+point exceeding it fails with MemoryError (and is quarantined) instead of the
+worker being killed, and the peak memory of the points is reported.
+"""
+
+__all__ = ['Sweep', 'Result', 'figure', 'load', 'quarantined', 'retry', 'run', 'submit', 'worker_pool']
+
+import copy
+import json
+import logging
+import multiprocessing as mp
+import os
+import time
+from collections import OrderedDict, namedtuple
+from functools import partial
+
+import numpy as np
+
+import entropy
+import utils
+from progress import Progress
+
+
+# Options of the entropies, as in the original figures: Maple, with SymPy as backup.
+DEFAULTS = {'method': 'maple-async', 'backup_method': 'sympy-parallel', 'precision': 15}
+
+# Entropy functions (from the 'entropy' module) required by each quantity.
+ENTROPIES = {
+    'H': ('external',),
+    'H_ON': ('ON_external',),
+    'H_OFF': ('OFF_external',),
+    'I': ('external', 'ON_external', 'OFF_external'),
+}
+DISTRIBUTIONS = ('phi', 'alpha', 'beta')
+PARAMETRIZATIONS = ('N', 'mu', 'mu_alpha')
+
+# Pool workers can't create their own pools, so methods run serially inside them.
+SERIAL_METHOD = {'sympy-parallel': 'sympy', 'maple-async': 'maple'}
+
+# Significant digits of parameters when merging points of different sweeps.
+DEDUP_DIGITS = 12
+
+CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+
+
+Result = namedtuple('Result', ['axes', 'params', 'values'])
+Result.__doc__ = """Values of a sweep.
+
+    :axes: ordered dictionary of axis name -> values
+    :params: dictionary of parameter ('epsilon', 'palpha', 'N', plus the original
+        parametrization) -> array with the shape of the mesh
+    :values: dictionary of quantity -> array with the shape of the mesh (with an extra
+        last dimension of size len(axes['n']) for distributions)
+    """
+
+
+class Sweep:
+    """A set of quantities to be evaluated in the mesh of some parameter axes.
+
+    :name: sweep name, used for logging
+    :quantities: list of quantities, see ENTROPIES and DISTRIBUTIONS
+    :axes: ordered dictionary of axis name -> values
+    :method: entropy calculation method, see 'entropy.H_external'
+    :backup_method: (list of) backup method(s) to try if 'method' fails
+    :precision: number of decimal digits of precision
+    :refine: None or a tuple (axis, options) of an axis to be refined when the sweep is
+        run, with 'options' being the keyword arguments of 'utils.adaptive_points'
+        (except 'func'); the values in 'axes' are used until then
+    """
+    def __init__(self, name, quantities, axes, method=DEFAULTS['method'],
+                 backup_method=DEFAULTS['backup_method'], precision=DEFAULTS['precision'], refine=None):
+        unknown = set(quantities) - set(ENTROPIES) - set(DISTRIBUTIONS)
+        if unknown:
+            raise ValueError("{}: unknown quantities {}".format(name, sorted(unknown)))
+        parametrization = [p for p in PARAMETRIZATIONS if p in axes]
+        if 'epsilon' not in axes or 'palpha' not in axes or len(parametrization) != 1:
+            raise ValueError("{}: axes must be 'epsilon', 'palpha' and one of {}".format(name, PARAMETRIZATIONS))
+        if ('n' in axes) != any(q in DISTRIBUTIONS for q in quantities):
+            raise ValueError("{}: the 'n' axis is required by (and only by) distributions".format(name))
+        if refine is not None and (refine[0] not in axes or refine[0] == 'n' or not set(quantities) & set(ENTROPIES)):
+            raise ValueError("{}: only parameter axes of sweeps with entropies can be refined".format(name))
+
+        self.name = name
+        self.quantities = list(quantities)
+        self.axes = OrderedDict((k, np.atleast_1d(np.asarray(v, dtype=np.float64))) for k, v in axes.items())
+        self.parametrization = parametrization[0]
+        self.method = method
+        self.backup_method = [backup_method] if isinstance(backup_method, str) else backup_method
+        self.precision = precision
+        self.refine = refine
+
+    def __repr__(self):
+        return "Sweep({!r}, {}, axes={})".format(
+            self.name, self.quantities, {k: len(v) for k, v in self.axes.items()})
+
+    def params(self):
+        """Parameters ε, pₐ and N (and the original parametrization) in the mesh of the axes."""
+        import reparam
+        names = [k for k in self.axes if k != 'n']
+        mesh = np.meshgrid(*(self.axes[k] for k in names), indexing='ij')
+        params = dict(zip(names, mesh))
+        if self.parametrization == 'mu':
+            _, _, params['N'] = reparam.from_mu(params['epsilon'], params['palpha'], params['mu'])
+        elif self.parametrization == 'mu_alpha':
+            _, _, params['N'] = reparam.from_mu_alpha(params['epsilon'], params['palpha'], params['mu_alpha'])
+        return params
+
+    def tasks(self, params=None):
+        """Entropy calculations required by this sweep, as a dictionary of index -> task per function."""
+        params = self.params() if params is None else params
+        funcs = sorted({f for q in self.quantities for f in ENTROPIES.get(q, ())})
+        backup = None if self.backup_method is None else tuple(self.backup_method)
+        tasks = {}
+        for func in funcs:
+            for index in np.ndindex(params['N'].shape):
+                point = (_round(params['epsilon'][index]), _round(params['palpha'][index]), _round(params['N'][index]))
+                tasks[func, index] = (func,) + point + (self.method, backup, self.precision)
+        return tasks
+
+
+def load(config=None, figures=None):
+    """Load sweeps declared in the configuration.
+
+    :config: configuration dictionary, or None to read the configuration file
+    :figures: list of sections (figure names) to load sweeps from, or None for all
+    :returns: ordered dictionary of (figure, sweep name) -> Sweep
+    """
+    if config is None:
+        with open(CONFIG_FILE) as file:
+            config = json.load(file, object_pairs_hook=OrderedDict)
+    sweeps = OrderedDict()
+    for figure, section in config.items():
+        if figures is not None and figure not in figures or not isinstance(section, dict):
+            continue
+        for sweep_name, spec in section.get('sweeps', {}).items():
+            spec = dict(DEFAULTS, **spec)
+            quantities = spec.pop('quantities')
+            options = {k: spec.pop(k) for k in DEFAULTS}
+            axes = OrderedDict()
+            for axis, value in spec.items():
+                if isinstance(value, dict) and 'adaptive' in value:
+                    if 'refine' in options:
+                        raise ValueError("{}/{}: only one axis may be adaptive".format(figure, sweep_name))
+                    options['refine'] = (axis, _adaptive(value))
+                    value = {'plot_points': value['adaptive'], 'logspace': value.get('logspace', False)}
+                axes[axis] = _grid(value, section)
+            sweeps[figure, sweep_name] = Sweep('{}/{}'.format(figure, sweep_name), quantities, axes, **options)
+    return sweeps
+
+
+def run(sweeps, processes=None, progress_file=None, pool=None):
+    """Evaluate sweeps, computing the union of their entropy calculations at most once.
+
+    Adaptive axes are refined level by level after the initial grids of all the
+    sweeps are evaluated, so the points of each level are computed in parallel.
+
+    :sweeps: dictionary of key -> Sweep
+    :processes: number of worker processes, default is the number of CPUs
+    :progress_file: file to append progress records to, see the 'progress' module
+    :pool: a pool shared with other sweeps (see 'worker_pool'), used instead of a new one
+        and left running; 'processes' is then only reported
+    :returns: dictionary of key -> Result
+    """
+    shared = pool is not None
+    workers = processes or os.cpu_count()
+
+    def evaluate(sweeps, log_level=logging.INFO, name='sweep'):
+        nonlocal pool
+        params, tasks, values, missing = _prepare(sweeps, log_level)
+        if missing:
+            if pool is None:
+                pool = worker_pool(workers)
+            with Progress(len(values) + len(missing), name, workers, progress_file) as progress:
+                progress.cached(len(values))
+                for task in missing:
+                    progress.submitted(task[4])
+                for task, (value, backend, seconds, memory) in zip(missing, pool.imap(_entropy_task, missing)):
+                    values[task] = value
+                    progress.completed(backend, seconds, failed=value is None, memory=memory, requested=task[4])
+        return {key: _result(sweep, params[key], tasks[key], values) for key, sweep in sweeps.items()}
+
+    try:
+        results = evaluate(sweeps)
+        if any(sweep.refine for sweep in sweeps.values()):
+            sweeps = OrderedDict((key, _refined(sweep, evaluate) if sweep.refine else sweep)
+                                 for key, sweep in sweeps.items())
+            results = evaluate(sweeps)
+        return results
+    finally:
+        if pool is not None and not shared:
+            pool.terminate()
+
+
+def submit(sweeps, pool, progress=None):
+    """Submit the missing entropy calculations of sweeps to a pool, without waiting for them.
+
+    Calculations are submitted sweep by sweep, in the given order, and those
+    shared by several sweeps only once.  Workers store the values in the cache,
+    so that 'run' (or 'figure') returns without computing anything, even in
+    another process, once the jobs of its sweeps are ready.  Only the initial
+    grid of adaptive axes is submitted, their refinement is left to 'run' with
+    the same pool, once the grid is ready.
+
+    :sweeps: dictionary of key -> Sweep
+    :pool: a pool shared by all the sweeps, see 'worker_pool'
+    :progress: a 'progress.Progress' to count the sweeps' points in, or None
+    :returns: dictionary of key -> list of AsyncResult objects
+    """
+    _, tasks, values, missing = _prepare(sweeps)
+    if progress is not None:
+        progress.total += len(values) + len(missing)
+        progress.cached(len(values))
+    missing = set(missing)
+    submitted = {}
+    jobs = OrderedDict()
+    for key, sweep_tasks in tasks.items():
+        jobs[key] = []
+        for task in sorted(set(sweep_tasks.values()) & missing, key=repr):
+            if task not in submitted:
+                callback = None
+                if progress is not None:
+                    progress.submitted(task[4])
+                    callback = partial(_completed, progress, task[4])
+                submitted[task] = pool.apply_async(_entropy_task, [task], callback=callback)
+            jobs[key].append(submitted[task])
+    return jobs
+
+
+def quarantined(sweeps=None):
+    """Points that failed and are skipped by the sweeps until retried.
+
+    :sweeps: dictionary of key -> Sweep to restrict the points to those the
+        sweeps may use, or None for all; points of an adaptive sweep are only
+        matched by function and options, as its refined axis is not known here
+    :returns: dictionary of task -> record, where a task is a tuple (function,
+        ε, pₐ, N, method, backup methods, precision) and a record has the
+        'reason' of the failure, its 'time', the 'peak_memory' of the worker (in
+        bytes) and the failed retry 'attempts'
+    """
+    cache = _quarantine()
+    tasks = list(cache)
+    if sweeps is not None:
+        grid, options = set(), set()
+        for sweep in sweeps.values():
+            if sweep.refine:
+                backup = None if sweep.backup_method is None else tuple(sweep.backup_method)
+                options.update((f,) + (sweep.method, backup, sweep.precision)
+                               for q in sweep.quantities for f in ENTROPIES.get(q, ()))
+            else:
+                grid.update(sweep.tasks().values())
+        tasks = [task for task in tasks if task in grid or (task[0],) + task[4:] in options]
+    return {task: cache[task] for task in tasks}
+
+
+def retry(method=None, backup_method=None, precision=None, processes=None, progress_file=None):
+    """Compute the points in quarantine again, possibly with other options.
+
+    Values obtained are cached as those of the original points, so that sweeps
+    find them, and the points leave the quarantine.  Points that fail again stay
+    in quarantine, with the attempt recorded.
+
+    :method: calculation method, default is the original one
+    :backup_method: (list of) backup method(s), default is the original one(s)
+    :precision: number of decimal digits of precision, default is the original one
+    :processes: number of worker processes, default is the number of CPUs
+    :progress_file: file to append progress records to, see the 'progress' module
+    :returns: number of points recovered
+    """
+    if isinstance(backup_method, str):
+        backup_method = (backup_method,)
+    elif backup_method is not None:
+        backup_method = tuple(backup_method)
+    pairs = []
+    for original in sorted(quarantined(), key=repr):
+        task = list(original)
+        for position, option in ((4, method), (5, backup_method), (6, precision)):
+            if option is not None:
+                task[position] = option
+        pairs.append((original, tuple(task)))
+    if not pairs:
+        return 0
+
+    workers = processes or os.cpu_count()
+    recovered = 0
+    with worker_pool(workers) as pool, Progress(len(pairs), 'retry', workers, progress_file) as progress:
+        for _, task in pairs:
+            progress.submitted(task[4])
+        for (_, task), (value, backend, seconds, memory) in zip(pairs, pool.imap(_retry_task, pairs)):
+            recovered += value is not None
+            progress.completed(backend, seconds, failed=value is None, memory=memory, requested=task[4])
+    logging.info("sweep: %d of %d points in quarantine recovered", recovered, len(pairs))
+    return recovered
+
+
+def worker_pool(processes=None):
+    """Pool of worker processes for the entropy calculations, with the memory limit of 'entropy'.
+
+    :processes: number of worker processes, default is the number of CPUs
+    :returns: a 'multiprocessing.Pool'
+    """
+    return mp.Pool(processes or os.cpu_count(), utils.limit_memory, [entropy.MEMORY_LIMIT])
+
+
+def figure(config, name, processes=None):
+    """Evaluate the sweeps of a figure.
+
+    :config: configuration dictionary, or None to read the configuration file
+    :name: figure name (configuration section)
+    :processes: number of worker processes, default is the number of CPUs
+    :returns: dictionary of sweep name -> Result
+    """
+    results = run(load(config, [name]), processes)
+    return {sweep_name: result for (_, sweep_name), result in results.items()}
+
+
+### Internals ###
+
+quarantine_cache = None
+def _quarantine():
+    """Persistent store of failed points, opened only when first needed."""
+    global quarantine_cache
+    if quarantine_cache is None:
+        quarantine_cache = utils.LazyCache(os.path.join(utils.CACHE_DIR, 'quarantine'))
+    return quarantine_cache
+
+def _round(x):
+    """Round to DEDUP_DIGITS significant digits, so that equal points from different grids match."""
+    return float('{:.{}g}'.format(x, DEDUP_DIGITS))
+
+def _adaptive(spec):
+    """Arguments of 'utils.adaptive_points' from an adaptive axis specification."""
+    spec = dict(spec)
+    options = dict(zip(('xmin', 'xmax', 'min_points'), spec.pop('adaptive')))
+    options.update({k: spec.pop(k) for k in ('logspace', 'tol', 'max_points') if k in spec})
+    if spec:
+        raise ValueError("unknown adaptive axis options: {}".format(sorted(spec)))
+    return options
+
+def _refined(sweep, evaluate):
+    """Copy of a sweep with its adaptive axis refined, see 'utils.adaptive_points'."""
+    axis, options = sweep.refine
+    position = [k for k in sweep.axes if k != 'n'].index(axis)
+    quantities = [q for q in sweep.quantities if q in ENTROPIES]
+
+    def with_axis(values):
+        new = copy.copy(sweep)
+        new.axes = OrderedDict(sweep.axes)
+        new.axes[axis] = np.asarray(values, dtype=np.float64)
+        return new
+
+    def func(x):
+        result = evaluate({sweep.name: with_axis(x)}, logging.DEBUG, sweep.name)[sweep.name]
+        return np.stack([np.moveaxis(result.values[q], position, -1) for q in quantities])
+
+    x, _ = utils.adaptive_points(func, **options)
+    logging.info("sweep: %s refined to %d points in the '%s' axis", sweep.name, len(x), axis)
+    return with_axis(x)
+
+def _grid(spec, section):
+    """Axis values from their specification, see the module documentation."""
+    if isinstance(spec, str):
+        if not spec.startswith('$'):
+            raise ValueError("invalid axis specification: {!r}".format(spec))
+        return _grid(section[spec[1:]], section)
+    if isinstance(spec, (int, float)):
+        return np.array([spec], dtype=np.float64)
+    if isinstance(spec, list):
+        return np.concatenate([_grid(s, section) for s in spec]) if spec else np.array([])
+
+    spec = dict(spec)
+    if 'plot_points' in spec:
+        values = utils.plot_points(*spec.pop('plot_points'), logspace=spec.pop('logspace', False))
+    elif 'linspace' in spec:
+        values = np.linspace(*spec.pop('linspace'))
+    elif 'geomspace' in spec:
+        values = np.geomspace(*spec.pop('geomspace'))
+    else:
+        raise ValueError("invalid axis specification: {!r}".format(spec))
+    if 'slice' in spec:
+        values = values[slice(*spec.pop('slice'))]
+    if 'extra' in spec:
+        values = np.array(sorted(np.concatenate([values, _grid(spec.pop('extra'), section)])))
+    if spec.pop('integer', False):
+        values = np.unique(np.ceil(values))
+    if spec:
+        raise ValueError("unknown axis options: {}".format(sorted(spec)))
+    return values
+
+@utils.memoized(depends=entropy.CALCULATION_MODULES)
+def _entropy(func, epsilon, palpha, N, method, backup_method, precision):
+    """Entropy calculation of a sweep, in a worker process, see '_calculate'.
+
+    Failures are not cached, they raise RuntimeError instead.
+
+    :returns: a float
+    """
+    return _calculate(func, epsilon, palpha, N, method, backup_method, precision)[0]
+
+def _calculate(func, epsilon, palpha, N, method, backup_method, precision):
+    """Entropy calculation of a sweep and the method that computed it.
+
+    The method and the backup methods are tried in turn here, instead of by
+    'entropy', to know which one succeeded.  Failures raise RuntimeError.
+
+    :returns: a float and a method name
+    """
+    entropy_func = getattr(entropy, 'H_' + func)
+    for backend in [method] + list(backup_method or []):
+        backend = SERIAL_METHOD.get(backend, backend)
+        res = entropy_func(epsilon, palpha, N, precision=precision, method=backend)
+        if res is not None:
+            return float(res), backend
+    raise RuntimeError("no result from method '{}' (backup: {}) with precision {}".format(
+        method, backup_method, precision))
+
+def _prepare(sweeps, log_level=logging.INFO):
+    """Parameters and tasks of the sweeps, cached values and unique tasks missing from the cache."""
+    params = {key: sweep.params() for key, sweep in sweeps.items()}
+    tasks = {key: sweep.tasks(params[key]) for key, sweep in sweeps.items()}
+    unique = sorted(set(task for sweep_tasks in tasks.values() for task in sweep_tasks.values()), key=repr)
+    total = sum(len(sweep_tasks) for sweep_tasks in tasks.values())
+
+    values = {}
+    missing = []
+    n_quarantined = 0
+    for task in unique:
+        try:
+            values[task] = _entropy.lookup(*task)
+        except KeyError:
+            if task in _quarantine():
+                values[task] = None  # left for 'retry'
+                n_quarantined += 1
+            else:
+                missing.append(task)
+    if total:
+        logging.log(log_level, "sweep: %d entropy calculations, %d unique, %d to be computed", total, len(unique), len(missing))
+    if n_quarantined:
+        logging.warning("sweep: %d points skipped, in quarantine (see 'sweep.py list')", n_quarantined)
+    return params, tasks, values, missing
+
+def _entropy_task(task, quarantine=True):
+    """Entropy calculation of a sweep, the method that computed it (the requested one
+    if all failed), the time it took, in seconds, and the peak memory, in bytes.
+
+    Values are checkpointed in the cache as they are computed, and failed points
+    are put in quarantine (unless 'quarantine' is False) with the failure reason.
+    """
+    utils.peak_memory(reset=True)
+    start = time.perf_counter()
+    try:
+        value, backend = _calculate(*task)
+        _entropy.store(value, *task)
+    except Exception as error:  # including MemoryError, from the worker's memory limit
+        value, backend = None, task[4]
+        reason = "{}: {}".format(type(error).__name__, error)
+        logging.debug("sweep: point %s failed: %s", task, reason)
+        if quarantine:
+            _quarantine()[task] = {'reason': reason, 'time': time.time(), 'peak_memory': utils.peak_memory(),
+                                   'attempts': []}
+    return value, backend, time.perf_counter() - start, utils.peak_memory()
+
+def _retry_task(tasks):
+    """Calculation of a point in quarantine with other options, see 'retry'."""
+    original, task = tasks
+    value, backend, seconds, memory = _entropy_task(task, quarantine=False)
+    record = _quarantine()[original]
+    if value is None:
+        record['attempts'].append({'method': task[4], 'backup_method': task[5], 'precision': task[6],
+                                   'time': time.time(), 'peak_memory': memory})
+        _quarantine()[original] = record
+    else:
+        _entropy.store(value, *original)
+        del _quarantine()[original]
+    return value, backend, seconds, memory
+
+def _completed(progress, requested, result):
+    """Pool callback counting a point computed by a worker."""
+    value, backend, seconds, memory = result
+    progress.completed(backend, seconds, failed=value is None, memory=memory, requested=requested)
+
+def _result(sweep, params, tasks, values):
+    """Assemble the values of a sweep from the entropy calculations and distributions."""
+    shape = params['N'].shape
+    H = {}
+    for (func, index), task in tasks.items():
+        value = values[task]
+        H.setdefault(func, np.full(shape, np.nan))[index] = np.nan if value is None else value
+
+    results = {}
+    for quantity in sweep.quantities:
+        if quantity == 'I':
+            palpha = params['palpha']
+            results[quantity] = H['external'] - palpha*H['ON_external'] - (1 - palpha)*H['OFF_external']
+        elif quantity in ENTROPIES:
+            results[quantity] = H[ENTROPIES[quantity][0]]
+
+    distributions = [q for q in sweep.quantities if q in DISTRIBUTIONS]
+    if distributions:
+        import numeric
+        n = sweep.axes['n']
+        for quantity in distributions:
+            results[quantity] = np.empty(shape + n.shape)
+        for index in np.ndindex(shape):
+            dist = numeric.dist_external(params['epsilon'][index], params['palpha'][index], params['N'][index], n)
+            for quantity in distributions:
+                results[quantity][index] = dist[DISTRIBUTIONS.index(quantity)]
+
+    return Result(sweep.axes, params, results)
+
+
+if __name__ == '__main__':
+    import sys
+
+    usage = "Usage: sweep.py list | retry [method [precision]]"
+    logging.basicConfig(format='[%(levelname)s] %(message)s', level=logging.INFO)
+    if sys.argv[1:2] == ['list']:
+        for task, record in sorted(quarantined().items(), key=repr):
+            print("H_{}(ε={}, pₐ={}, N={}) method={} backup={} precision={}".format(*task))
+            memory = record.get('peak_memory')
+            memory = "" if memory is None else ", {:.0f} MB peak".format(memory/1e6)
+            print("    {} ({} retries{})".format(record['reason'], len(record['attempts']), memory))
+    elif sys.argv[1:2] == ['retry'] and len(sys.argv) <= 4:
+        method = sys.argv[2] if len(sys.argv) > 2 else None
+        precision = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        retry(method, precision=precision)
+    else:
+        sys.exit(usage)
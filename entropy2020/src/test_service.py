@@ -0,0 +1,65 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Tests of the entropy service and its client, against a server on a free port.
+
+Usage:
+    python -m unittest test_service
+"""
+
+import asyncio
+import threading
+import unittest
+
+import entropy
+import entropy_async
+import service
+
+
+class ClientTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+        server = cls.loop.run_until_complete(service.Server(port=0).start())
+        cls.server = server
+        cls.client = service.Client('http://{}:{}/'.format(service.HOST, server.sockets[0].getsockname()[1]),
+                                    timeout=60)
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.server.close()
+        cls.loop.close()
+        entropy_async.shutdown()
+
+    def test_method_option(self):
+        """The entropy option 'method' reaches the server, instead of clashing with Client.call."""
+        res = self.client.H_external(2, 0.5, 10, method='numeric', precision=entropy.DOUBLE_PRECISION)
+        self.assertAlmostEqual(res, entropy.H_external(2, 0.5, 10, method='fsp', precision=entropy.DOUBLE_PRECISION),
+                               places=12)
+        res = self.client.call('I_external', epsilon=2, palpha=0.5, N=10, method='fsp',
+                               precision=entropy.DOUBLE_PRECISION)
+        self.assertAlmostEqual(res, entropy.I_external(2, 0.5, 10, method='numeric',
+                                                       precision=entropy.DOUBLE_PRECISION), places=12)
+
+    def test_unknown_method_option(self):
+        with self.assertRaises(service.ServiceError):
+            self.client.H_external(2, 0.5, 10, method='unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+# vim: fileencoding=utf-8
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, you can obtain one at https://mozilla.org/MPL/2.0/
+#
+# Copyright 2020 Alexandre Ferreira Ramos - AMPhyBio Laboratory
+#
+# Project:  github.com/amphybio/stochastic-gene-expression
+# Version:  1.0
+# Created:  18-10-2026
+# Authors:  Leonardo R. Gama <leonardo.gama@usp.br>
+
+"""
+Time-dependent distributions and entropies of the externally regulated gene.
+
+The solution of the master equation truncated at K products (see 'fsp') is the
+action of the sparse matrix exponential, exp(t⋅A)⋅p₀.  Explicit methods (Taylor
+series, uniformization) cost O(t⋅‖A‖) sparse products, and ‖A‖ grows with N and
+K, so they are used only for short times.  Other times are grouped in windows
+[t, WINDOW_RATIO⋅t], each evaluated with one sparse (banded) factorization of
+I - γ⋅A: the shift-and-invert Krylov method approximates exp(t⋅A)⋅p₀ for all
+the times of the window from a single small basis, at a cost independent of t.
+Time is measured in units of the protein lifetime (1/ρ).
+
+By default the gene is induced at t = 0, i.e. it starts with no products and the
+promoter OFF; the switching rates then lead to the steady state with parameters
+(ε, pₐ, N).  Conditional entropies use the promoter probabilities at time t.
+
+Example:
+    >>> t = np.linspace(0, 10, 101)
+    >>> H, H_ON, H_OFF = transient.H_external(1, 0.5, 100, t)
+    >>> I = transient.I_external(1, 0.5, 100, t)
+"""
+
+__all__ = ['H_external', 'I_external', 'dist_external', 'initial_state']
+
+import numpy as np
+from scipy import linalg as dense_linalg
+from scipy import sparse
+from scipy.sparse import linalg
+
+import fsp
+import numeric
+
+
+# Largest t⋅‖A‖₁ evaluated with the explicit method (scipy's expm_multiply).
+EXPLICIT_NORM = 50
+
+# Ratio between the last and first times of a window of the Krylov method, and
+# between the first time and the shift γ.
+WINDOW_RATIO = 4
+SHIFT_RATIO = 10
+
+# Tolerance (absolute, in probability) and maximum dimension of the Krylov bases.
+KRYLOV_TOL = 1e-12
+KRYLOV_MAX_DIM = 200
+
+
+def initial_state(K, promoter='OFF', n=0):
+    """Initial probability vector with all the mass at one state.
+
+    :K: number of states for the products
+    :promoter: promoter state, 'ON' or 'OFF'
+    :n: number of products
+    :returns: array of size 2K, ordered as the states of 'fsp.generator'
+    """
+    if promoter not in ('ON', 'OFF'):
+        raise ValueError("promoter must be either 'ON' or 'OFF'")
+    p0 = np.zeros(2*K)
+    p0[2*n + (promoter == 'OFF')] = 1
+    return p0
+
+
+def dist_external(epsilon, palpha, N, t, p0=None, K=None):
+    """Distributions of the externally regulated gene at times t.
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: steady-state probability of finding the promotor at the ON state
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :t: (array of) time(s) >= 0, in units of the protein lifetime
+    :p0: initial probability vector (see 'initial_state'), default is OFF with no products
+    :K: number of states for the products, default is 'fsp.truncation(N)'
+    :returns: 3-tuple of arrays with φₙ(t), αₙ(t) and βₙ(t), of shape t.shape + (K,)
+    """
+    t = np.asarray(t, dtype=np.float64)
+    if np.any(t < 0):
+        raise ValueError("times must be >= 0")
+    if K is None:
+        K = fsp.truncation(N) if p0 is None else len(p0)//2
+    A = fsp.generator(epsilon, palpha, N, K)
+    p = initial_state(K) if p0 is None else np.asarray(p0, dtype=np.float64)
+
+    times, index = np.unique(t.ravel(), return_inverse=True)
+    norm = abs(A).sum(axis=0).max()
+    res = np.empty((times.size, 2*K))
+    start = 0
+    while start < times.size:
+        if times[start]*norm <= EXPLICIT_NORM:
+            res[start] = linalg.expm_multiply(times[start]*A, p)
+            start += 1
+        else:
+            stop = np.searchsorted(times, WINDOW_RATIO*times[start], side='right')
+            res[start:stop] = _shift_invert_krylov(A, p, times[start:stop], times[start]/SHIFT_RATIO)
+            start = stop
+    res = np.maximum(res, 0)[index]
+    res = res.reshape(t.shape + (2*K,))
+    alpha, beta = res[..., 0::2], res[..., 1::2]
+    return alpha + beta, alpha, beta
+
+
+def H_external(epsilon, palpha, N, t, p0=None, K=None):
+    """Shannon entropies of the externally regulated gene at times t, in bits.
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: steady-state probability of finding the promotor at the ON state
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :t: (array of) time(s) >= 0, in units of the protein lifetime
+    :p0: initial probability vector (see 'initial_state'), default is OFF with no products
+    :K: number of states for the products, default is 'fsp.truncation(N)'
+    :returns: 3-tuple of arrays with H(t), H_ON(t) and H_OFF(t), of the shape of t
+    """
+    return _entropies(dist_external(epsilon, palpha, N, t, p0, K))[:3]
+
+
+def I_external(epsilon, palpha, N, t, p0=None, K=None):
+    """Mutual information between the number of products and the promoter state at times t.
+
+    :epsilon: ratio between promotor switching rates and protein degradation rate
+    :palpha: steady-state probability of finding the promotor at the ON state
+    :N: mean number of proteins of a constitutive gene with the same synthesis/degradation rates
+    :t: (array of) time(s) >= 0, in units of the protein lifetime
+    :p0: initial probability vector (see 'initial_state'), default is OFF with no products
+    :K: number of states for the products, default is 'fsp.truncation(N)'
+    :returns: array of the shape of t
+    """
+    H, H_ON, H_OFF, p_on = _entropies(dist_external(epsilon, palpha, N, t, p0, K))
+    return H - p_on*H_ON - (1 - p_on)*H_OFF
+
+
+### Internals ###
+
+def _shift_invert_krylov(A, v, times, gamma):
+    """exp(t⋅A)⋅v for the given times, by the shift-and-invert Krylov method.
+
+    An orthonormal basis V of the Krylov space of Z = (I - γ⋅A)⁻¹ and v is built by
+    Arnoldi's method (with reorthogonalization), with Z⋅V ≈ V⋅H, so that A ≈ V⋅B⋅Vᵀ
+    with B = (I - H⁻¹)/γ and exp(t⋅A)⋅v ≈ ‖v‖⋅V⋅exp(t⋅B)⋅e₁.  The basis grows until
+    the approximations stop changing (by KRYLOV_TOL).
+    """
+    n = v.size
+    lu = linalg.splu(sparse.identity(n, format='csc') - gamma*A, permc_spec='NATURAL', diag_pivot_thresh=0)
+    beta = np.linalg.norm(v)
+    V = np.zeros((KRYLOV_MAX_DIM + 1, n))
+    H = np.zeros((KRYLOV_MAX_DIM + 1, KRYLOV_MAX_DIM))
+    V[0] = v/beta
+    res = None
+    for m in range(1, KRYLOV_MAX_DIM + 1):
+        w = lu.solve(V[m - 1])
+        for _ in range(2):
+            h = V[:m] @ w
+            w -= h @ V[:m]
+            H[:m, m - 1] += h
+        H[m, m - 1] = np.linalg.norm(w)
+        breakdown = H[m, m - 1] <= KRYLOV_TOL*np.abs(H[:m, m - 1]).max()
+        if m % 10 == 0 or breakdown or m == KRYLOV_MAX_DIM:
+            B = (np.eye(m) - np.linalg.inv(H[:m, :m]))/gamma
+            previous, res = res, np.array([beta*(dense_linalg.expm(t*B)[:, 0] @ V[:m]) for t in times])
+            if breakdown or previous is not None and np.abs(res - previous).max() <= KRYLOV_TOL:
+                return res
+        V[m] = w/H[m, m - 1]
+    return res
+
+def _entropies(dists):
+    """H, H_ON and H_OFF of (φ, α, β), and the probability of the ON state."""
+    phi, alpha, beta = dists
+    p_on = numeric.compensated_sum(alpha.reshape(-1, alpha.shape[-1]), axis=-1).reshape(alpha.shape[:-1])
+    res = []
+    for p, norm in ((phi, 1.), (alpha, p_on), (beta, 1 - p_on)):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p = p/np.asarray(norm)[..., np.newaxis]  # conditional distributions
+            terms = np.where(p > 0, p*np.log2(p), 0)
+        H = -numeric.compensated_sum(terms.reshape(-1, terms.shape[-1]), axis=-1).reshape(terms.shape[:-1])
+        res.append(np.where(norm > 0, H, 0.))  # entropy of an impossible promoter state is taken as 0
+    return tuple(res) + (p_on,)
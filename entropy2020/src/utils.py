@@ -15,14 +15,22 @@
 Gerenal programming utilities.
 """
 
-__all__ = ['decorator_with_options', 'memoized', 'plot_points']
+__all__ = [
+        'LazyCache', 'adaptive_points', 'decorator_with_options', 'lazy_import', 'limit_memory', 'memoized',
+        'peak_memory', 'plot_points', 'source_version',
+]
 
 import atexit
 import hashlib
+import importlib.util
 import inspect
 import logging
+import pathlib
 import pickle
 import os
+import resource
+import sys
+import types
 from collections import abc
 from multiprocessing import pool
 from math import ceil, log2, log10
@@ -37,6 +45,80 @@ except ImportError:
     from pip.utils.appdirs import user_cache_dir
 
 
+def lazy_import(name):
+    """Import a module only when one of its attributes is first accessed.
+
+    Unlike importlib.util.LazyLoader, safe to use from concurrent threads: the
+    first access imports the module with importlib.import_module, whose module
+    locks make other threads wait until it is fully executed.
+
+    :name: absolute name of the module
+    :returns: the module, or a proxy to it if it is not loaded yet
+    """
+    try:
+        return sys.modules[name]
+    except KeyError:
+        pass
+    if importlib.util.find_spec(name) is None:
+        raise ImportError("No module named {!r}".format(name), name=name)
+    return _LazyModule(name)
+
+class _LazyModule(types.ModuleType):
+    """Proxy of a module not loaded yet, see 'lazy_import'."""
+    def __getattr__(self, attr):
+        module = self.__dict__.get('_module')
+        if module is None:
+            module = self.__dict__['_module'] = importlib.import_module(self.__name__)
+        return getattr(module, attr)
+
+
+def source_version(*modules):
+    """Hash of the source files of modules in this directory, to invalidate caches when they change.
+
+    :modules: module names, or names of other files with their extension (e.g. 'default.pal')
+    :returns: hexadecimal digest
+    """
+    root = pathlib.Path(__file__).parent.resolve()
+    md5 = hashlib.md5()
+    for module in modules:
+        md5.update((root/(module if '.' in module else module + '.py')).read_bytes())
+    return md5.hexdigest()
+
+
+def limit_memory(n_bytes):
+    """Limit the address space of the current process, allocations beyond it raise MemoryError.
+
+    Meant as the initializer of worker processes (and 'preexec_fn' of subprocesses).
+
+    :n_bytes: maximum size in bytes, or None for no limit
+    """
+    if n_bytes is not None:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        soft = n_bytes if hard == resource.RLIM_INFINITY else min(n_bytes, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def peak_memory(reset=False):
+    """Peak resident memory of the current process and of its waited-for children, in bytes.
+
+    On Linux, the peak of the current process can be reset, so that it is measured
+    per task; the peak of the children is always the maximum since the process start.
+
+    :reset: reset the peak of the current process after reading it
+    :returns: number of bytes
+    """
+    scale = 1 if sys.platform == 'darwin' else 1024  # kilobytes on Linux
+    self_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*scale
+    try:
+        with open('/proc/self/status') as status:
+            self_peak = next(int(line.split()[1])*1024 for line in status if line.startswith('VmHWM:'))
+        if reset:
+            with open('/proc/self/clear_refs', 'w') as clear_refs:
+                clear_refs.write('5')
+    except (OSError, StopIteration):
+        pass
+    return max(self_peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss*scale)
+
 def decorator_with_options(decorator):
     """Make a decorator usable with or without arguments.
 
@@ -120,13 +202,57 @@ def _normalize_type(obj, round_digits=15):
             return obj
 
 
+class LazyCache:
+    """A diskcache.Cache that is only opened (and its directory created) on first use.
+
+    :directory: location (directory path) of cache files
+    :settings: keyword arguments to diskcache.Cache
+    """
+    def __init__(self, directory, **settings):
+        self.directory = directory
+        self.settings = settings
+        self._cache = None
+
+    def open(self):
+        if self._cache is None:
+            self._cache = diskcache.Cache(self.directory, **self.settings)
+        return self._cache
+
+    def close(self):
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.open(), name)
+
+    def __contains__(self, key):
+        return key in self.open()
+
+    def __getitem__(self, key):
+        return self.open()[key]
+
+    def __setitem__(self, key, value):
+        self.open()[key] = value
+
+    def __delitem__(self, key):
+        del self.open()[key]
+
+    def __iter__(self):
+        return iter(self.open())
+
+    def __len__(self):
+        return len(self.open())
+
+
 # Memoization decorator.
 CACHE_DIR = user_cache_dir('amphybio')
-os.makedirs(CACHE_DIR, exist_ok=True)
 
 @decorator_with_options
 def memoized(func, *, size_limit=10**8, eviction_policy='least-recently-used', cache_dir=CACHE_DIR,
-             typed=False, round_digits=15, ignore_args=None):
+             typed=False, round_digits=15, ignore_args=None, cache_none=True, depends=None):
     """Persistent memoization function decorator with argument normalization and ignore list.
 
     :func: a callable object that is not a method
@@ -138,12 +264,18 @@ def memoized(func, *, size_limit=10**8, eviction_policy='least-recently-used', c
         different arguments lists
     :round_digits: number of digits to round to, pass False to disable rounding
     :ignore_args: name or list of names of parameters to ignore
+    :cache_none: whether to cache None results, pass False if None means a failure that may not recur
+    :depends: name or list of names of local modules (or other files) whose source code is part of the cache
+        version, besides the function's own code (see 'source_version')
     :returns: a memoized version of function 'func'
     """
     func_hash = hashlib.md5(func.__code__.co_code).hexdigest()
+    if depends is not None:
+        version = source_version(*([depends] if isinstance(depends, str) else depends))
+        func_hash = hashlib.md5((version + func_hash).encode()).hexdigest()
     func_id = "{}.{:0>4s}".format(func.__qualname__, func_hash[-4:])
     cache_dir = os.path.join(cache_dir, func_id)
-    func.cache = diskcache.Cache(cache_dir, size_limit=size_limit, eviction_policy=eviction_policy)
+    func.cache = LazyCache(cache_dir, size_limit=size_limit, eviction_policy=eviction_policy)
     func.async_results = {}
 
     atexit.register(func.cache.close)
@@ -152,7 +284,7 @@ def memoized(func, *, size_limit=10**8, eviction_policy='least-recently-used', c
     def consolidate_async():
         for key, result in func.async_results.items():
             try:
-                if result.successful():
+                if result.successful() and (cache_none or result.get() is not None):
                     func.cache[dict(sorted(key))] = result.get()
             # Exception class changed in Python 3.7:
             # https://docs.python.org/3/library/multiprocessing.html#multiprocessing.pool.AsyncResult.successful
@@ -164,16 +296,18 @@ def memoized(func, *, size_limit=10**8, eviction_policy='least-recently-used', c
         ignore_args = frozenset([ignore_args] if isinstance(ignore_args, str) else ignore_args)
         assert all(arg in arg_names for arg in ignore_args), "Unknown argument name passed to 'ignore_args' option."
 
-    @wraps(func)
-    def wrapper(*args, **kwargs):
+    def make_key(args, kwargs):
         key = kwargs.copy()
         key.update(zip(arg_names, args))
         if ignore_args is not None:
             key = {k: v for k, v in key.items() if k not in ignore_args}
         if not typed:
             key = {k: _normalize_type(v, round_digits) for k, v in key.items()}
-        key = dict(sorted(key.items()))
+        return dict(sorted(key.items()))
 
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = make_key(args, kwargs)
         try:
             return func.cache[key]
         except KeyError:
@@ -184,10 +318,20 @@ def memoized(func, *, size_limit=10**8, eviction_policy='least-recently-used', c
                 value = func(*args, **kwargs)
                 if isinstance(value, pool.AsyncResult):
                     func.async_results[tuple(key.items())] = value
-                else:
+                elif cache_none or value is not None:
                     func.cache[key] = value
                 return value
 
+    def lookup(*args, **kwargs):
+        """Return the cached value for these arguments, raise KeyError if there is none."""
+        return func.cache[make_key(args, kwargs)]
+
+    def store(value, *args, **kwargs):
+        """Set the cached value for these arguments, e.g. computed by other means."""
+        func.cache[make_key(args, kwargs)] = value
+
+    wrapper.lookup = lookup
+    wrapper.store = store
     return wrapper
 
 # Functions for saving and loading cache values from pickle files.
@@ -241,3 +385,57 @@ def plot_points(xmin, xmax, min_points, logspace=False):
     if len(points) < min_points:
         return plot_points(xmin, xmax, min_points + 1, logspace)
     return points
+
+
+def adaptive_points(func, xmin, xmax, min_points, logspace=False, tol=0.01, max_points=None):
+    """Generate points in range [xmin:xmax] refined where 'func' is poorly interpolated.
+
+    Starts from plot_points(xmin, xmax, min_points, logspace) and bisects, in the
+    same scale (log10(x + 1) if 'logspace'), every interval whose midpoint value
+    deviates from the linear interpolation of its ends by more than 'tol' times
+    the range of the curve.  The midpoints of the aligned points are points of
+    denser plot_points grids, so that they are shared between runs and figures.
+
+    :func: vectorized function of an array of points, returning an array of shape
+        (..., len(points)), i.e. one or more curves with the points in the last axis
+    :tol: maximum interpolation error relative to the range of each curve
+    :max_points: stop refining when this number of points is reached, default is
+        8 times 'min_points'; when it cuts a level short, the halves of the intervals
+        with the largest errors are refined first
+    :returns: tuple of the points and the values of 'func' at them
+    """
+    if max_points is None:
+        max_points = 8*min_points
+    scale, unscale = (lambda x: np.log10(x + 1), lambda u: 10**u - 1) if logspace else (np.asarray, np.asarray)
+
+    x = plot_points(xmin, xmax, min_points, logspace)
+    y = np.asarray(func(x), dtype=np.float64)
+    active = np.arange(len(x) - 1)
+    # Error of the interval each active one is half of, or for the initial grid the
+    # curvature (second difference) at the interval's ends.
+    priority = np.zeros(active.size)
+    if len(x) > 2:
+        curvature = np.fmax.reduce(np.abs(np.diff(y, 2, axis=-1)).reshape(-1, len(x) - 2), axis=0)
+        ends = np.pad(np.nan_to_num(curvature), 1)
+        priority = np.maximum(ends[:-1], ends[1:])
+    while active.size and len(x) < max_points:
+        if active.size > max_points - len(x):
+            keep = np.sort(np.argsort(-priority, kind='stable')[:max_points - len(x)])
+            active, priority = active[keep], priority[keep]
+        u = scale(x)
+        x_mid = unscale((u[active] + u[active + 1])/2)
+        y_mid = np.asarray(func(x_mid), dtype=np.float64)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            y_range = np.nanmax(y, axis=-1, keepdims=True) - np.nanmin(y, axis=-1, keepdims=True)
+            error = np.abs(y_mid - (y[..., active] + y[..., active + 1])/2)/y_range
+        error = np.where(np.isnan(error), 0, error)  # failed points and flat curves aren't refined
+        error = np.max(error.reshape(-1, active.size), axis=0)
+        refine = np.flatnonzero(error > tol)
+
+        x = np.insert(x, active + 1, x_mid)
+        y = np.insert(y, active + 1, y_mid, axis=-1)
+        left = active[refine] + refine  # position of the intervals' left ends after insertion
+        active = np.sort(np.concatenate([left, left + 1]))
+        priority = np.repeat(error[refine], 2)
+    return x, y